@@ -11,7 +11,8 @@ This module implements the core ACE architecture:
 
 import json
 import os
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
@@ -23,6 +24,13 @@ except ImportError:
     GENAI_AVAILABLE = False
     genai = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -35,82 +43,73 @@ PLAYBOOK_HISTORY_DIR = Path("data/playbook_history")
 WEEKLY_REFLECTIONS_DIR = Path("weekly_reflections")
 TRADING_SESSIONS_DIR = Path("trading_session")
 
-# Ensure directories exist
-for directory in [PLAYBOOK_PATH.parent, PLAYBOOK_HISTORY_DIR, WEEKLY_REFLECTIONS_DIR, TRADING_SESSIONS_DIR]:
+# Ensure directories exist (PLAYBOOK_HISTORY_DIR sits under PLAYBOOK_PATH.parent, so parents=True covers both)
+for directory in (PLAYBOOK_HISTORY_DIR, WEEKLY_REFLECTIONS_DIR, TRADING_SESSIONS_DIR):
     directory.mkdir(parents=True, exist_ok=True)
 
 # --- Playbook Management ---
 
+# (id, content) of the bullets every new playbook starts with, per section
+_SEED_BULLETS = {
+    "strategies_and_hard_rules": (
+        ("strat-001", "Only trade during NY session (9:30 AM - 4:00 PM EST)"),
+        ("strat-002", "Avoid trading 30min before/after high-impact news"),
+        ("strat-003", "Minimum risk-reward ratio: 1:1.5"),
+    ),
+    "useful_code_and_templates": (
+        ("code-001", "Position sizing: (account_balance * risk_pct) / (entry - stop)"),
+    ),
+    "troubleshooting_and_pitfalls": (
+        ("pit-001", "Low liquidity after 3:00 PM EST - avoid new entries"),
+    ),
+}
+
+
 def initialize_playbook() -> Dict[str, Any]:
     """
     Create initial playbook with basic trading rules.
     This is only run once on first execution.
     """
-    initial_playbook = {
+    now = datetime.now(timezone.utc).isoformat()
+    return {
         "metadata": {
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "created_at": now,
+            "last_updated": now,
             "version": "1.0",
-            "total_bullets": 5
+            "total_bullets": sum(map(len, _SEED_BULLETS.values()))
         },
         "sections": {
-            "strategies_and_hard_rules": [
-                {
-                    "id": "strat-001",
-                    "content": "Only trade during NY session (9:30 AM - 4:00 PM EST)",
-                    "helpful_count": 0,
-                    "harmful_count": 0,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "last_used": None
-                },
-                {
-                    "id": "strat-002",
-                    "content": "Avoid trading 30min before/after high-impact news",
-                    "helpful_count": 0,
-                    "harmful_count": 0,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "last_used": None
-                },
-                {
-                    "id": "strat-003",
-                    "content": "Minimum risk-reward ratio: 1:1.5",
-                    "helpful_count": 0,
-                    "harmful_count": 0,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "last_used": None
-                }
-            ],
-            "useful_code_and_templates": [
+            section: [
                 {
-                    "id": "code-001",
-                    "content": "Position sizing: (account_balance * risk_pct) / (entry - stop)",
+                    "id": bullet_id,
+                    "content": content,
                     "helpful_count": 0,
                     "harmful_count": 0,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "last_used": None
-                }
-            ],
-            "troubleshooting_and_pitfalls": [
-                {
-                    "id": "pit-001",
-                    "content": "Low liquidity after 3:00 PM EST - avoid new entries",
-                    "helpful_count": 0,
-                    "harmful_count": 0,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "created_at": now,
                     "last_used": None
                 }
+                for bullet_id, content in bullets
             ]
+            for section, bullets in _SEED_BULLETS.items()
         }
     }
-    
-    return initial_playbook
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way
+_loads_json = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _playbook_to_json_bytes(playbook: Dict[str, Any]) -> bytes:
+    """Serialize a playbook as indented JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(playbook, option=orjson.OPT_INDENT_2)
+    return json.dumps(playbook, indent=2).encode("utf-8")
 
 
 def load_playbook() -> Dict[str, Any]:
     """Load playbook from file, or create if doesn't exist."""
     if PLAYBOOK_PATH.exists():
-        with open(PLAYBOOK_PATH, 'r') as f:
-            return json.load(f)
+        return _loads_json(PLAYBOOK_PATH.read_bytes())
     else:
         print("📚 Initializing new playbook...")
         playbook = initialize_playbook()
@@ -123,19 +122,31 @@ def save_playbook(playbook: Dict[str, Any]) -> None:
     # Update metadata
     playbook["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
     
-    # Save current playbook
-    with open(PLAYBOOK_PATH, 'w') as f:
-        json.dump(playbook, f, indent=2)
+    # Serialize once for both the current playbook and its backup
+    payload = _playbook_to_json_bytes(playbook)
+    
+    # Save current playbook atomically so a crash mid-write never leaves a truncated file
+    tmp_path = PLAYBOOK_PATH.with_suffix(".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, PLAYBOOK_PATH)
     
     # Create versioned backup
     version = playbook["metadata"]["version"]
     backup_path = PLAYBOOK_HISTORY_DIR / f"playbook_v{version}.json"
-    with open(backup_path, 'w') as f:
-        json.dump(playbook, f, indent=2)
+    backup_path.write_bytes(payload)
     
     print(f"✅ Playbook saved (version {version})")
 
 
+def _index_bullets(playbook: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Map each bullet ID to its bullet dicts (in playbook order) so lookups skip the section scan."""
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for section in playbook["sections"].values():
+        for bullet in section:
+            index.setdefault(bullet["id"], []).append(bullet)
+    return index
+
+
 def generate_bullet_id(section: str) -> str:
     """Generate a unique bullet ID."""
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -143,6 +154,24 @@ def generate_bullet_id(section: str) -> str:
     return f"{prefix}-{timestamp}"
 
 
+def clean_json_response(text: str) -> str:
+    """Strip markdown fences and surrounding prose from a model response, leaving the JSON text."""
+    payload = text
+    body = text.lstrip()
+    # Only a leading ```json (or bare ```) fence counts; the closing fence may be missing
+    if body[:3] == "```":
+        start = 7 if body[3:7].lower() == "json" else 3
+        end = body.find("```", start)
+        payload = body[start:end] if end != -1 else body[start:]
+    
+    # Outermost {...} span, dropping any prose around it
+    start = payload.find("{")
+    end = payload.rfind("}")
+    if start != -1 and end > start:
+        return payload[start:end + 1]
+    return payload.strip()
+
+
 # --- Generator Component ---
 
 GENERATOR_SYSTEM_PROMPT = """
@@ -328,32 +357,11 @@ def run_generator(playbook: Dict[str, Any], market_data: Dict[str, Any]) -> Dict
             }
         
         # Clean JSON if wrapped in markdown
-        if plan_text.startswith("```"):
-            # Split by ``` and get the content between markers
-            parts = plan_text.split("```")
-            if len(parts) >= 3:  # Should have opening ```, content, and closing ```
-                plan_text = parts[1].strip()
-            elif len(parts) >= 2:  # Has opening ``` and content, maybe no closing
-                plan_text = parts[1].strip()
-            else:
-                # Just remove the opening ```
-                plan_text = plan_text[3:].strip()
-            
-            # Remove language identifier if present (json, JSON, etc.)
-            if plan_text.startswith("json"):
-                plan_text = plan_text[4:].strip()
-            elif plan_text.startswith("JSON"):
-                plan_text = plan_text[4:].strip()
-        
-        # Remove any trailing markdown markers
-        if plan_text.endswith("```"):
-            plan_text = plan_text[:-3].strip()
-        if plan_text.endswith("```"):
-            plan_text = plan_text[:-3].strip()
+        plan_text = clean_json_response(plan_text)
         
         # Try to parse JSON
         try:
-            plan = json.loads(plan_text)
+            plan = _loads_json(plan_text)
         except json.JSONDecodeError as json_err:
             print(f"❌ JSON parsing failed: {json_err}")
             print(f"📄 First 500 chars of response: {plan_text[:500]}")
@@ -362,8 +370,9 @@ def run_generator(playbook: Dict[str, Any], market_data: Dict[str, Any]) -> Dict
         
         # Update playbook usage
         if "playbook_bullets_used" in plan:
+            bullet_index = _index_bullets(playbook)
             for bullet_id in plan["playbook_bullets_used"]:
-                update_bullet_usage(playbook, bullet_id)
+                update_bullet_usage(playbook, bullet_id, bullet_index)
         
         return plan
         
@@ -392,13 +401,27 @@ def run_generator(playbook: Dict[str, Any], market_data: Dict[str, Any]) -> Dict
         }
 
 
-def update_bullet_usage(playbook: Dict[str, Any], bullet_id: str) -> None:
-    """Update last_used timestamp for a bullet."""
-    for section in playbook["sections"].values():
-        for bullet in section:
-            if bullet["id"] == bullet_id:
-                bullet["last_used"] = datetime.now(timezone.utc).isoformat()
-                return
+# [epoch second, ISO timestamp] - bullet usage only needs second resolution
+_USAGE_TIMESTAMP_CACHE = [-1, ""]
+
+
+def _usage_timestamp() -> str:
+    """Return the current UTC time as ISO-8601, formatted at most once per second."""
+    second = int(time.time())
+    if second != _USAGE_TIMESTAMP_CACHE[0]:
+        _USAGE_TIMESTAMP_CACHE[0] = second
+        _USAGE_TIMESTAMP_CACHE[1] = datetime.fromtimestamp(second, timezone.utc).isoformat()
+    return _USAGE_TIMESTAMP_CACHE[1]
+
+
+def update_bullet_usage(playbook: Dict[str, Any], bullet_id: str,
+                        bullet_index: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
+    """Update last_used timestamp for a bullet (pass a shared bullet_index when updating many)."""
+    if bullet_index is None:
+        bullet_index = _index_bullets(playbook)
+    bullets = bullet_index.get(bullet_id)
+    if bullets:
+        bullets[0]["last_used"] = _usage_timestamp()
 
 
 # --- Executor Component ---
@@ -415,7 +438,8 @@ def simulate_trade_execution(trading_plan: Dict[str, Any], market_price_history:
         Trade log with execution details
     """
     trade_log = {
-        "plan_id": trading_plan.get("date", datetime.now().strftime("%Y-%m-%d")),
+        # Only fall back to today's date when the plan has none (a .get default is evaluated eagerly)
+        "plan_id": trading_plan["date"] if "date" in trading_plan else date.today().isoformat(),
         "execution": None,
         "feedback": {
             "entry_quality": "not_triggered",
@@ -647,29 +671,11 @@ Output: Strict JSON format as specified in the research protocol.
             }
         
         # Clean JSON if wrapped in markdown
-        if reflection_text.startswith("```"):
-            parts = reflection_text.split("```")
-            if len(parts) >= 3:  # Should have opening ```, content, and closing ```
-                reflection_text = parts[1].strip()
-            elif len(parts) >= 2:  # Has opening ``` and content, maybe no closing
-                reflection_text = parts[1].strip()
-            else:
-                # Just remove the opening ```
-                reflection_text = reflection_text[3:].strip()
-            
-            # Remove language identifier if present
-            if reflection_text.startswith("json"):
-                reflection_text = reflection_text[4:].strip()
-            elif reflection_text.startswith("JSON"):
-                reflection_text = reflection_text[4:].strip()
-        
-        # Remove any trailing markdown markers
-        if reflection_text.endswith("```"):
-            reflection_text = reflection_text[:-3].strip()
+        reflection_text = clean_json_response(reflection_text)
         
         # Try to parse JSON
         try:
-            reflection = json.loads(reflection_text)
+            reflection = _loads_json(reflection_text)
         except json.JSONDecodeError as json_err:
             print(f"❌ JSON parsing failed: {json_err}")
             print(f"📄 First 500 chars of response: {reflection_text[:500]}")
@@ -716,6 +722,82 @@ def save_reflection(reflection: Dict[str, Any]) -> None:
 
 # --- Curator Component ---
 
+def _curate_add_bullet(playbook: Dict[str, Any], insight: Dict[str, Any],
+                       bullet_index: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Add a new bullet to the section named by the insight."""
+    section_name = insight.get("section", "strategies_and_hard_rules")
+    if section_name in playbook["sections"]:
+        new_bullet = {
+            "id": generate_bullet_id(section_name),
+            "content": insight.get("content", ""),
+            "helpful_count": 0,
+            "harmful_count": 0,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "last_used": None
+        }
+        playbook["sections"][section_name].append(new_bullet)
+        bullet_index.setdefault(new_bullet["id"], []).append(new_bullet)
+        playbook["metadata"]["total_bullets"] += 1
+        print(f"➕ Added bullet: {new_bullet['id']}")
+
+
+def _curate_increment_helpful(playbook: Dict[str, Any], insight: Dict[str, Any],
+                              bullet_index: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Increment helpful count for the insight's bullet."""
+    bullet_id = insight.get("bullet_id")
+    if bullet_id:
+        for bullet in bullet_index.get(bullet_id, ()):
+            bullet["helpful_count"] += 1
+            print(f"👍 Incremented helpful count for {bullet_id}")
+
+
+def _curate_increment_harmful(playbook: Dict[str, Any], insight: Dict[str, Any],
+                              bullet_index: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Increment harmful count for the insight's bullet."""
+    bullet_id = insight.get("bullet_id")
+    if bullet_id:
+        for bullet in bullet_index.get(bullet_id, ()):
+            bullet["harmful_count"] += 1
+            print(f"👎 Incremented harmful count for {bullet_id}")
+
+
+def _curate_review_bullet(playbook: Dict[str, Any], insight: Dict[str, Any],
+                          bullet_index: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Mark for manual review (could auto-remove if harmful >> helpful)."""
+    print(f"⚠️  Bullet {insight.get('bullet_id')} flagged for review")
+
+
+# Curator handler per Reflector suggested_action; unknown actions are ignored
+_CURATOR_ACTIONS = {
+    "add_bullet": _curate_add_bullet,
+    "increment_helpful": _curate_increment_helpful,
+    "increment_harmful": _curate_increment_harmful,
+    "review_bullet": _curate_review_bullet,
+}
+
+
+# Below this many bullets the plain comprehension beats the numpy call overhead
+_VECTORIZED_PRUNE_MIN = 512
+
+
+def _prune_keep_mask(section: List[Dict[str, Any]]) -> List[bool]:
+    """Vectorized form of the prune rule: keep bullets with harmful <= helpful + 2."""
+    # Imported here: only oversized sections take this path, so the ACE core stays numpy-free
+    import numpy as np
+
+    count = len(section)
+    harmful = np.fromiter((b["harmful_count"] for b in section), dtype=np.int64, count=count)
+    helpful = np.fromiter((b["helpful_count"] for b in section), dtype=np.int64, count=count)
+    return (harmful <= helpful + 2).tolist()
+
+
+def _bump_version(version: str) -> str:
+    """Advance a "major.minor" version by one tenth (1.9 -> 2.0) using integer parts."""
+    major, minor = map(int, version.split("."))
+    major, minor = divmod(major * 10 + minor + 1, 10)
+    return f"{major}.{minor}"
+
+
 def run_curator(reflection: Dict[str, Any], current_playbook: Dict[str, Any]) -> Dict[str, Any]:
     """
     Update playbook based on Reflector insights.
@@ -733,66 +815,32 @@ def run_curator(reflection: Dict[str, Any], current_playbook: Dict[str, Any]) ->
         Updated playbook
     """
     updated_playbook = json.loads(json.dumps(current_playbook))  # Deep copy
+    bullet_index = _index_bullets(updated_playbook)
     
     for insight in reflection.get("insights", []):
-        action = insight.get("suggested_action")
-        
-        if action == "add_bullet":
-            # Add new bullet to specified section
-            section_name = insight.get("section", "strategies_and_hard_rules")
-            if section_name in updated_playbook["sections"]:
-                new_bullet = {
-                    "id": generate_bullet_id(section_name),
-                    "content": insight.get("content", ""),
-                    "helpful_count": 0,
-                    "harmful_count": 0,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "last_used": None
-                }
-                updated_playbook["sections"][section_name].append(new_bullet)
-                updated_playbook["metadata"]["total_bullets"] += 1
-                print(f"➕ Added bullet: {new_bullet['id']}")
-        
-        elif action == "increment_helpful":
-            # Increment helpful count for bullet
-            bullet_id = insight.get("bullet_id")
-            if bullet_id:
-                for section in updated_playbook["sections"].values():
-                    for bullet in section:
-                        if bullet["id"] == bullet_id:
-                            bullet["helpful_count"] += 1
-                            print(f"👍 Incremented helpful count for {bullet_id}")
-        
-        elif action == "increment_harmful":
-            # Increment harmful count for bullet
-            bullet_id = insight.get("bullet_id")
-            if bullet_id:
-                for section in updated_playbook["sections"].values():
-                    for bullet in section:
-                        if bullet["id"] == bullet_id:
-                            bullet["harmful_count"] += 1
-                            print(f"👎 Incremented harmful count for {bullet_id}")
-        
-        elif action == "review_bullet":
-            # Mark for manual review (could auto-remove if harmful >> helpful)
-            bullet_id = insight.get("bullet_id")
-            print(f"⚠️  Bullet {bullet_id} flagged for review")
+        handler = _CURATOR_ACTIONS.get(insight.get("suggested_action"))
+        if handler:
+            handler(updated_playbook, insight, bullet_index)
     
     # Prune bullets where harmful_count > helpful_count + 2
+    total_removed = 0
     for section_name, section in updated_playbook["sections"].items():
         original_count = len(section)
-        updated_playbook["sections"][section_name] = [
-            bullet for bullet in section
-            if bullet["harmful_count"] <= bullet["helpful_count"] + 2
-        ]
-        removed_count = original_count - len(updated_playbook["sections"][section_name])
+        if original_count >= _VECTORIZED_PRUNE_MIN:
+            section[:] = [bullet for bullet, keep in zip(section, _prune_keep_mask(section)) if keep]
+        else:
+            section[:] = [
+                bullet for bullet in section
+                if bullet["harmful_count"] <= bullet["helpful_count"] + 2
+            ]
+        removed_count = original_count - len(section)
         if removed_count > 0:
-            updated_playbook["metadata"]["total_bullets"] -= removed_count
+            total_removed += removed_count
             print(f"🗑️  Removed {removed_count} harmful bullets from {section_name}")
+    updated_playbook["metadata"]["total_bullets"] -= total_removed
     
     # Increment version
-    current_version = float(updated_playbook["metadata"]["version"])
-    updated_playbook["metadata"]["version"] = f"{current_version + 0.1:.1f}"
+    updated_playbook["metadata"]["version"] = _bump_version(updated_playbook["metadata"]["version"])
     
     return updated_playbook
 
@@ -825,10 +873,12 @@ def load_trade_logs_for_week(week_ending_date: str = None) -> List[Dict[str, Any
         date_str = date.strftime("%Y_%m_%d")
         log_path = TRADING_SESSIONS_DIR / date_str / "trade_log.json"
         
-        if log_path.exists():
+        # Open directly rather than stat first; days without a session are simply missing
+        try:
             with open(log_path, 'r') as f:
-                log = json.load(f)
-                weekly_logs.append(log)
+                weekly_logs.append(json.load(f))
+        except FileNotFoundError:
+            continue
     
     print(f"📊 Loaded {len(weekly_logs)} trade logs for week ending {week_ending_date}")
     return weekly_logs
@@ -24,8 +24,7 @@ try:
         send_telegram_message,
         TELEGRAM_BOT_TOKEN,
         TELEGRAM_CHAT_ID,
-        DATE_OUTPUT_DIR,
-        OUTPUT_DIR
+        DATE_OUTPUT_DIR
     )
     MARKET_PLANNER_AVAILABLE = True
 except ImportError as e:
@@ -65,8 +64,7 @@ def ace_daily_cycle_integrated():
     print("=" * 70)
     
     # Ensure directories exist
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    DATE_OUTPUT_DIR.mkdir(exist_ok=True)
+    DATE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)  # also creates OUTPUT_DIR
     
     # Step 1: Load Playbook
     print("\n[1/7] Loading Playbook...")
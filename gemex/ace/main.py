@@ -25,7 +25,6 @@ from market_planner import (
     export_charts,
     SYMBOLS,
     DATE_OUTPUT_DIR,
-    OUTPUT_DIR,
     send_telegram_message,
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_CHAT_ID
@@ -187,8 +186,7 @@ def run_daily_cycle() -> Dict[str, Any]:
     print("=" * 60)
     
     # Ensure output directories exist
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    DATE_OUTPUT_DIR.mkdir(exist_ok=True)
+    DATE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)  # also creates OUTPUT_DIR
     
     # Step 1: Load Playbook
     print("\n[1/7] Loading Playbook...")
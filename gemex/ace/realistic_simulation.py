@@ -7,12 +7,29 @@ instead of using deterministic hash-based outcomes.
 
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
+import pandas as pd
 import yfinance as yf
 
 
+def _fetch_session_prices(start_time: datetime, end_time: datetime) -> pd.DataFrame:
+    """Fetch 15-minute EURUSD bars between two (naive, exchange-time) datetimes."""
+    return yf.Ticker("EURUSD=X").history(start=start_time, end=end_time, interval="15m")
+
+
+def _session_window(price_data: pd.DataFrame, start_time: datetime, end_time: datetime) -> pd.DataFrame:
+    """Slice preloaded bars to [start_time, end_time), localized like the yfinance index."""
+    if price_data.empty or not isinstance(price_data.index, pd.DatetimeIndex):
+        # A failed yfinance download comes back as an empty frame with a plain Index
+        return price_data.iloc[:0]
+    tz = price_data.index.tz
+    start, end = pd.Timestamp(start_time, tz=tz), pd.Timestamp(end_time, tz=tz)
+    return price_data[(price_data.index >= start) & (price_data.index < end)]
+
+
 def simulate_trade_with_real_data(
     trading_plan: Dict[str, Any],
-    lookback_hours: int = 8
+    lookback_hours: int = 8,
+    price_data: Optional[pd.DataFrame] = None
 ) -> Dict[str, Any]:
     """
     Simulate trade execution using actual historical price data.
@@ -25,6 +42,7 @@ def simulate_trade_with_real_data(
     Args:
         trading_plan: The trading plan with entry zone, SL, TP levels
         lookback_hours: How many hours after plan generation to check (default 8 for NY session)
+        price_data: Preloaded 15-minute bars covering the session; fetched when omitted
         
     Returns:
         Trade log with realistic execution details
@@ -73,15 +91,13 @@ def simulate_trade_with_real_data(
         plan_date = datetime.strptime(trading_plan["date"], "%Y-%m-%d")
         
         # Get 15-minute data for the day (gives us detailed price action)
-        ticker = yf.Ticker("EURUSD=X")
         start_time = plan_date.replace(hour=13, minute=0)  # 1 PM UTC (9 AM EST - just before NY open)
         end_time = start_time + timedelta(hours=lookback_hours)
         
-        price_data = ticker.history(
-            start=start_time,
-            end=end_time,
-            interval="15m"
-        )
+        if price_data is None:
+            price_data = _fetch_session_prices(start_time, end_time)
+        else:
+            price_data = _session_window(price_data, start_time, end_time)
         
         if price_data.empty:
             # No data available (weekend/holiday) - fall back to simple simulation
@@ -269,13 +285,27 @@ def backtest_trading_plan(
     end = datetime.strptime(end_date, "%Y-%m-%d")
     current = start
     
+    # One download for the whole range; each day slices its own session from it
+    try:
+        price_data = _fetch_session_prices(
+            start.replace(hour=13), end.replace(hour=13) + timedelta(hours=8)
+        )
+    except Exception as e:
+        print(f"⚠️  Error fetching backtest price data, falling back to per-day fetches: {e}")
+        price_data = None
+    else:
+        # yfinance logs failed downloads (e.g. ranges past its 60-day 15m limit) and returns an empty frame
+        if price_data.empty or not isinstance(price_data.index, pd.DatetimeIndex):
+            print("⚠️  No backtest price data for the full range, falling back to per-day fetches")
+            price_data = None
+    
     while current <= end:
         # Skip weekends
         if current.weekday() < 5:  # Monday = 0, Friday = 4
             daily_plan = trading_plan.copy()
             daily_plan["date"] = current.strftime("%Y-%m-%d")
             
-            result = simulate_trade_with_real_data(daily_plan)
+            result = simulate_trade_with_real_data(daily_plan, price_data=price_data)
             results.append(result)
         
         current += timedelta(days=1)
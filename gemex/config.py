@@ -2,10 +2,15 @@
 """
 Shared constants for Telegram messaging system.
 Centralizes visual indicators and psychology tips to avoid duplication across files.
+
+Both tables are read-only reference data, so they are frozen at import time:
+the mappings are ``MappingProxyType`` views and the tip pools are tuples.
 """
 
-VISUAL_INDICATORS = {
-    "emojis": {
+from types import MappingProxyType
+
+VISUAL_INDICATORS = MappingProxyType({
+    "emojis": MappingProxyType({
         "go": "✅",
         "wait": "⏸️", 
         "skip": "❌",
@@ -18,10 +23,10 @@ VISUAL_INDICATORS = {
         "decision": "🎯",
         "market": "📊",
         "action": "⚡"
-    }
-}
+    })
+})
 
-PSYCHOLOGY_TIPS = {
+_PSYCHOLOGY_TIPS = {
     'calm_market': [
         "🎯 Patience in calm markets prevents overtrading",
         "📊 Stick to your position sizing rules",
@@ -48,4 +53,6 @@ PSYCHOLOGY_TIPS = {
         "🎯 Focus on process, not outcomes",
         "📈 Consistency beats perfection"
     ]
-}
\ No newline at end of file
+}
+
+PSYCHOLOGY_TIPS = MappingProxyType({k: tuple(v) for k, v in _PSYCHOLOGY_TIPS.items()})
@@ -1,12 +1,18 @@
+import calendar
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from scipy.signal import find_peaks
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 import os
 import json
 import html
+import hashlib
 import re
+import time
+from functools import lru_cache
+from operator import attrgetter
+from typing import NamedTuple
 from pathlib import Path
 import cloudscraper
 from bs4 import BeautifulSoup
@@ -17,25 +23,52 @@ import requests
 import mplfinance as mpf
 import matplotlib.pyplot as plt
 import warnings
-from gemex.prompts import PLANNER_SYSTEM_PROMPT, REVIEWER_SYSTEM_PROMPT
+from gemex.prompts import (
+    PLANNER_SYSTEM_PROMPT_V1_LEGACY,
+    REVIEWER_SYSTEM_PROMPT_COMPRESSED_SHA256,
+    REVIEWER_SYSTEM_PROMPT_SHA256,
+    build_planner_messages,
+    build_reviewer_messages,
+)
+from gemex.schemas import ReviewerScores
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib parser is the fallback
+    orjson = None
 load_dotenv()
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing handlers still catch it
+_loads_json = orjson.loads if orjson is not None else json.loads
+
 # --- 0. MASTER CONFIGURATION ---
 
 # --- API and Model Setup ---
 # To run locally, set your API key as an environment variable:
 # export GOOGLE_API_KEY="your_api_key_here"
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY") #, userdata.get('GEMINI_API_KEY'))
+# A/B switch: score plans with the hand-compressed reviewer rubric
+USE_COMPRESSED_REVIEWER_PROMPT = os.environ.get("REVIEWER_PROMPT_COMPRESSED") == "true"
+# Planner cache namespace: "prod" for live runs, e.g. "eval-2025-10-16" for offline evaluations
+PLANNER_CACHE_NAMESPACE = os.environ.get("PLANNER_CACHE_NAMESPACE", "prod")
 
 # Only configure Gemini if we're actually running the main analysis
 # This allows testing modules to import without requiring the API key
-def configure_gemini():
+# Memoized so the planner and reviewer reuse one configured client (and its open
+# connection) instead of re-running genai.configure() and reconnecting per call
+@lru_cache(maxsize=8)
+def configure_gemini(system_instruction=None):
     """Configure Gemini API - only call this when actually needed."""
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY not found. Please set it as an environment variable.")
+    _configure_genai()
+    return genai.GenerativeModel("gemini-2.5-pro-latest", system_instruction=system_instruction)
+
+@lru_cache(maxsize=1)
+def _configure_genai():
+    """Configure the google.generativeai client once per process."""
     genai.configure(api_key=GEMINI_API_KEY)
-    return genai.GenerativeModel("gemini-2.5-pro-latest")
 
+@lru_cache(maxsize=1)
 def get_gemini_client():
     """Get Gemini client for new API."""
     if not GEMINI_API_KEY:
@@ -46,6 +79,13 @@ def get_gemini_client():
 # --- Telegram Configuration ---
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID")
+# Stay under Telegram's ~30 messages/second bot limit when sending split chunks
+TELEGRAM_MIN_SEND_INTERVAL = 1 / 28
+
+@lru_cache(maxsize=1)
+def _telegram_session():
+    """Shared HTTP session so chunked sends reuse one keep-alive connection."""
+    return requests.Session()
 
 # --- File Path Setup ---
 OUTPUT_DIR = Path("trading_session")
@@ -57,6 +97,18 @@ PLAN_OUTPUT_PATH = DATE_OUTPUT_DIR / "trade_plan.md"
 REVIEW_OUTPUT_PATH = DATE_OUTPUT_DIR / "review_scores.json"
 MT5_ALERTS_PATH = DATE_OUTPUT_DIR / "mt5_alerts.json"
 
+
+@lru_cache(maxsize=2)
+def previous_day_folder(today):
+    """Folder name (YYYY_MM_DD) for the calendar day before ``today``.
+
+    Weekends and holidays are not skipped, so on a Monday this names Sunday's folder.
+    Keyed by date so the cached value rolls over at midnight.
+    """
+    d = today - timedelta(days=1)
+    return f"{d.year:04d}_{d.month:02d}_{d.day:02d}"
+
+
 # --- Market Symbols ---
 SYMBOLS = {
     "EURUSD": "EURUSD=X",
@@ -395,6 +447,19 @@ def send_telegram_message(message, parse_mode="Markdown"):
         # Split into multiple messages
         return _send_split_messages(message, parse_mode, max_length)
 
+def _post_telegram(url, data):
+    """POST to the Bot API, waiting out a single 429 ``retry_after`` if asked to."""
+    response = _telegram_session().post(url, data=data, timeout=10)
+    if response.status_code == 429:
+        try:
+            retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+        except ValueError:
+            retry_after = 1
+        print(f"⏳ Telegram rate limit hit, retrying in {retry_after}s")
+        time.sleep(retry_after)
+        response = _telegram_session().post(url, data=data, timeout=10)
+    return response
+
 def _send_single_message(message, parse_mode):
     """Send a single message to Telegram."""
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
@@ -409,7 +474,7 @@ def _send_single_message(message, parse_mode):
         data["parse_mode"] = parse_mode
     
     try:
-        response = requests.post(url, data=data, timeout=10)
+        response = _post_telegram(url, data)
         # Provide clearer error diagnostics without relying solely on exceptions
         if not response.ok:
             try:
@@ -429,7 +494,7 @@ def _send_single_message(message, parse_mode):
                 "text": message
             }
             try:
-                response = requests.post(url, data=data_plain, timeout=10)
+                response = _post_telegram(url, data_plain)
                 if not response.ok:
                     try:
                         error_text = response.text
@@ -467,8 +532,9 @@ def _send_split_messages(message, parse_mode, max_length):
     if current_chunk:
         chunks.append(current_chunk.strip())
     
-    # Send all chunks
+    # Send all chunks, spaced out so a long plan never trips the rate limit
     success_count = 0
+    next_send = 0.0
     for i, chunk in enumerate(chunks, 1):
         if parse_mode == "HTML":
             chunk_header = f"<b>📄 Part {i} of {len(chunks)}</b>\n\n"
@@ -479,6 +545,10 @@ def _send_split_messages(message, parse_mode, max_length):
             chunk_header = f"📄 Part {i} of {len(chunks)}\n\n"
         full_chunk = chunk_header + chunk
         
+        delay = next_send - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        next_send = time.monotonic() + TELEGRAM_MIN_SEND_INTERVAL
         if _send_single_message(full_chunk, parse_mode):
             success_count += 1
         else:
@@ -1480,13 +1550,13 @@ def parse_agent_response(response_text):
     json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
     if json_match:
         try:
-            return json.loads(json_match.group(1))
+            return _loads_json(json_match.group(1))
         except json.JSONDecodeError:
             pass
     
     # Try to parse as direct JSON
     try:
-        return json.loads(response_text)
+        return _loads_json(response_text)
     except json.JSONDecodeError:
         pass
     
@@ -1679,61 +1749,8 @@ def planner_agent():
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
-    system_inst = """
-    **Persona:** You are a senior FX Analyst and Day Trader for a private fund. You specialize in identifying and executing high-probability trades on EURUSD, holding them for several hours to capture the primary directional move of the day. Your analysis is methodical, patient, and avoids short-term market noise.
-
-    **Task:** Your morning analysis, based on structured JSON data from chart and news agents, is complete. Synthesize this data into a comprehensive **intraday day trading plan for EURUSD**. The goal is to formulate one or two high-quality trade ideas for the day, not to actively scalp.
-
-    The output must be a well-structured and professional markdown document.
-
-    **Output Structure and Content:**
-
-    Your plan must be clear, patient, and focus on the bigger picture for the day. Follow this structure precisely:
-
-    ---
-
-    ### **1. Daily Market Thesis**
-    -   **Overarching Bias:** State your primary directional bias for the entire trading day (e.g., **Confident Bullish**, **Cautiously Bearish**, **Neutral/Range-Expansion**). Justify it in one sentence based on the market structure.
-    -   **Expected Daily Range:** Estimate the potential high and low for the day based on key levels and ATR (Average True Range).
-    -   **Decisive Catalyst:** Identify the single news event that will define the day's main volatility and could confirm or break your thesis.
-
-    ---
-
-    ### **2. Key Daily Levels**
-    -   **Major Resistance:** The significant daily or weekly level that could cap the day's rally. Provide a clear price (e.g., `1.0850`).
-    -   **Major Support:** The significant daily or weekly level that could halt a sell-off. Provide a clear price (e.g., `1.0720`).
-    -   **"Line in the Sand" Level:** Define the critical pivot point for the day. A sustained break of this level would force a re-evaluation of the entire daily bias.
-
-    ---
-
-    ### **3. Market Sentiment & Flow**
-    -   **Fundamental Wind:** Summarize the underlying economic sentiment (e.g., "Strong US data is driving dollar demand, creating underlying pressure on EURUSD").
-    -   **Price Action Narrative:** Describe what the price action is telling you (e.g., "Price is showing a healthy bullish trend, with orderly pullbacks to the 1-hour 50 EMA being bought aggressively").
-
-    ---
-
-    ### **4. Primary Day Trade Idea: [e.g., Long on Pullback to Value]**
-    -   **Trade Thesis:** A clear sentence on the strategic goal (e.g., "Entering long after a morning pullback to the established support area, targeting a new daily high during the NY session").
-    -   **Entry Zone & Trigger:** Define a **broader area** for entry, not a single price. Specify the trigger on a **15-minute or 1-hour chart** (e.g., "Look for entry within the `1.0740-1.0750` zone, triggered by a 1-hour hammer or bullish engulfing candle").
-    -   **Stop Loss (SL):** A logical price level placed below a key structural point (e.g., `1.0715`). *The pip distance should be wider to absorb volatility (e.g., 25-40 pips).*
-    -   **Take Profit (TP):** A logical price level targeting a major daily resistance or a key extension level (e.g., `1.0835`). *The pip distance should be substantial (e.g., 80-100+ pips).*
-    -   **Risk/Reward (RR) Ratio:** Calculate and state the RR ratio (e.g., `1:2.5` or better).
-
-    ---
-
-    ### **5. Risk & Trade Management**
-    -   **Position Size:** Define the risk per trade (e.g., "Risk **1%** of capital on this primary idea").
-    -   **Trade Management:** Outline how the trade will be managed once active (e.g., "Move SL to breakeven once the trade is +40 pips in profit. Consider taking partial profits at the `1.0800` psychological level").
-
-    ---
-
-    ### **6. Contingency Plan**
-    -   **If Thesis is Invalidated:** What is the alternative plan? (e.g., "If the 'Line in the Sand' level at `1.0720` breaks with conviction, the bullish thesis is void. We will stand aside and wait for a bearish retracement setup on Monday").
-    -   **Execution Note:** A key instruction for the day (e.g., "Patience is paramount. Do not force an entry if the price doesn't pull back to our zone. It's better to miss the trade than to take a bad one").
-    """
-
     final_plan = run_agent([types.Part.from_text(text=json.dumps(combined_data, indent=2))],
-                           system_instruction=system_inst)
+                           system_instruction=PLANNER_SYSTEM_PROMPT_V1_LEGACY)
 
     today_str = datetime.now().strftime('%Y%m%d')
     filepath = DATE_OUTPUT_DIR / f"Trading_plan_{today_str}.md"
@@ -1741,6 +1758,14 @@ def planner_agent():
         f.write(final_plan)
     print(f"Trading plan saved to {filepath}")
 
+# Locale abbreviations resolved once per process
+_DAY_ABBR = tuple(calendar.day_abbr)
+_MONTH_ABBR = tuple(calendar.month_abbr)
+
+def format_calendar_date(d):
+    """Format a date like Forex Factory's day-breaker rows, e.g. "Tue Sep 3" (no leading zero)."""
+    return f"{_DAY_ABBR[d.weekday()]} {_MONTH_ABBR[d.month]} {d.day}"
+
 def get_economic_calendar():
     """
     Correctly scrapes the Forex Factory economic calendar by handling
@@ -1766,8 +1791,8 @@ def get_economic_calendar():
         # This variable will hold the date as we iterate through the rows
         current_date = "Unknown"
 
-        # Use Linux-friendly date formatting (GitHub Actions runs on Linux by default)
-        today_str = datetime.now(timezone.utc).strftime('%a %b %-d').lstrip()
+        # Manual formatting avoids the platform-specific %-d strftime directive
+        today_str = format_calendar_date(datetime.now(timezone.utc))
         print(f"Filtering for today's date: '{today_str}'")
 
         for row in rows:
@@ -1883,8 +1908,7 @@ def download_from_github_artifacts():
             return None
         
         # Get yesterday's date
-        from datetime import timedelta
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y_%m_%d")
+        yesterday = previous_day_folder(date.today())
         
         # Try to find recent artifacts (last 7 days)
         headers = {'Authorization': f'token {github_token}'}
@@ -1984,8 +2008,7 @@ def download_from_github_artifacts():
 
 def load_local_previous_session():
     """Load previous session data from local files."""
-    from datetime import timedelta
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y_%m_%d")
+    yesterday = previous_day_folder(date.today())
     yesterday_dir = OUTPUT_DIR / yesterday
     
     if yesterday_dir.exists():
@@ -2068,8 +2091,7 @@ def load_session_data_from_path(session_path):
 
 def create_fallback_previous_context():
     """Create a fallback context when no previous session data is available."""
-    from datetime import timedelta
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y_%m_%d")
+    yesterday = previous_day_folder(date.today())
     
     return {
         "previousSessionDate": yesterday,
@@ -2212,8 +2234,7 @@ def generate_viper_packet():
     print("\n--- STAGE 1: GENERATING CHARTS AND ANALYSIS ---")
     
     # Ensure output directories exist
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    DATE_OUTPUT_DIR.mkdir(exist_ok=True)
+    DATE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)  # also creates OUTPUT_DIR
     print(f"📁 Creating date-based folder: {DATE_OUTPUT_DIR}")
     
     # 1. Generate charts
@@ -2345,22 +2366,104 @@ def create_compatibility_packet():
 
 # --- 2. LLM ORCHESTRATION MODULE ---
 
-def call_llm(system_prompt: str, user_prompt: str) -> str:
-    """A simple wrapper for calling the Gemini model."""
+def call_llm_messages(messages: list[dict], temperature: float | None = None, response_schema=None) -> str:
+    """Call Gemini with role-tagged messages.
+
+    The system message is sent as Gemini's system instruction so it stays a stable,
+    cacheable prefix ahead of the per-run user content. ``temperature`` overrides the
+    model default when given, and ``response_schema`` (a pydantic model) makes Gemini
+    return JSON matching that schema.
+    """
     print("...")
     try:
-        model = configure_gemini()
-        
-        # Combine system prompt and user prompt for Gemini
-        # Gemini doesn't have separate system/user roles like OpenAI, so we combine them
-        full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
-        
-        response = model.generate_content(full_prompt)
+        system_prompt = "\n\n".join(m["content"] for m in messages if m["role"] == "system") or None
+        contents = [
+            {"role": "model" if m["role"] == "assistant" else "user", "parts": [m["content"]]}
+            for m in messages
+            if m["role"] != "system"
+        ]
+        model = configure_gemini(system_instruction=system_prompt)
+        
+        generation_config = {}
+        if temperature is not None:
+            generation_config["temperature"] = temperature
+        if response_schema is not None:
+            generation_config["response_mime_type"] = "application/json"
+            generation_config["response_schema"] = response_schema
+        generation_config = generation_config or None
+        response = model.generate_content(contents, generation_config=generation_config)
         return response.text.strip()
     except Exception as e:
         print(f"An error occurred during the LLM call: {e}")
         return ""
 
+# Reviewer responses keyed by rubric hash + normalized request, so editing the
+# reviewer prompt automatically invalidates every cached score.
+_REVIEW_RESPONSE_CACHE: dict[str, str] = {}
+
+def _review_cache_key(user_prompt: str, prompt_sha256: str = REVIEWER_SYSTEM_PROMPT_SHA256) -> str:
+    """Build a whitespace-insensitive cache key for a reviewer request."""
+    normalized = " ".join(user_prompt.split())
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return f"{prompt_sha256}:{digest}"
+
+def call_reviewer(user_prompt: str, temperature: float = 0.0) -> str:
+    """Score a plan with the reviewer LLM, reusing cached scores for repeated plans.
+
+    Scoring at temperature 0 is deterministic, so re-reviewing the same packet and plan
+    returns the cached JSON. Sampled calls (temperature > 0) are never cached.
+    """
+    messages = build_reviewer_messages(user_prompt, compressed=USE_COMPRESSED_REVIEWER_PROMPT)
+    if temperature > 0:
+        return call_llm_messages(messages, temperature=temperature, response_schema=ReviewerScores)
+
+    prompt_sha256 = (
+        REVIEWER_SYSTEM_PROMPT_COMPRESSED_SHA256 if USE_COMPRESSED_REVIEWER_PROMPT else REVIEWER_SYSTEM_PROMPT_SHA256
+    )
+    key = _review_cache_key(user_prompt, prompt_sha256)
+    cached = _REVIEW_RESPONSE_CACHE.get(key)
+    if cached is not None:
+        print("♻️  Reusing cached reviewer scores")
+        return cached
+
+    review_output = call_llm_messages(messages, temperature=temperature, response_schema=ReviewerScores)
+    if review_output:
+        _REVIEW_RESPONSE_CACHE[key] = review_output
+    return review_output
+
+# Planner samples per (pool, request hash). Production has its own pool; every other
+# namespace shares the "eval" pool so evaluation runs reuse each other's samples.
+_PLANNER_RESPONSE_CACHE: dict[tuple[str, str], list[str]] = {}
+# How many samples each namespace has consumed per request hash
+_PLANNER_CACHE_CURSORS: dict[tuple[str, str], int] = {}
+
+def call_planner(messages: list[dict], namespace: str = PLANNER_CACHE_NAMESPACE) -> str:
+    """Call the planner through a namespace-aware, list-valued response cache.
+
+    Each request key (a hash of the full messages, so any prompt edit changes it) maps to
+    a list of samples. Within a namespace, every call returns the next unused sample, so
+    repeated calls stay independent draws. Another namespace in the same pool replays
+    the existing samples before generating new ones. Production never shares samples
+    with evaluation namespaces.
+    """
+    request_key = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+    pool = "prod" if namespace == "prod" else "eval"
+    samples = _PLANNER_RESPONSE_CACHE.setdefault((pool, request_key), [])
+    cursor_key = (namespace, request_key)
+    index = _PLANNER_CACHE_CURSORS.get(cursor_key, 0)
+
+    if index < len(samples):
+        print(f"♻️  Reusing cached planner sample {index + 1} ({namespace})")
+        plan = samples[index]
+    else:
+        plan = call_llm_messages(messages)
+        if not plan:
+            return plan
+        samples.append(plan)
+
+    _PLANNER_CACHE_CURSORS[cursor_key] = index + 1
+    return plan
+
 def clean_json_output(raw_output: str) -> str:
     """Clean and extract JSON from LLM output."""
     if not raw_output:
@@ -2394,6 +2497,11 @@ def clean_json_output(raw_output: str) -> str:
     
     return cleaned
 
+@lru_cache(maxsize=64)
+def _clean_json_output_cached(raw_output: str) -> str:
+    """Memoized clean_json_output for retried/identical reviewer outputs (pure function)."""
+    return clean_json_output(raw_output)
+
 def is_reviewer_analysis_text(analysis_text: str) -> bool:
     """Heuristically detect if text is the Reviewer analysis (markdown prose with scores).
 
@@ -2524,104 +2632,138 @@ def convert_analysis_to_json(analysis_text: str) -> str:
             "suggestions": ["Reviewer output could not be parsed"]
         }, indent=2)
 
-def extract_mt5_alerts_from_plan(trade_plan_text, current_price):
-    """Extract price levels from trading plan and generate MT5 alerts JSON."""
-    alerts = []
+# Price-level labels for MT5 alerts, in priority order: (group name, label, category, priority)
+_PRICE_LEVEL_LABELS = (
+    ("entry", r"Entry", "entry", "high"),
+    ("stop_loss", r"Stop Loss", "exit", "high"),
+    ("take_profit", r"Take Profit", "exit", "high"),
+    ("tp1", r"TP1", "exit", "high"),
+    ("tp2", r"TP2", "exit", "medium"),
+    ("upper_bound", r"Upper Bound", "level", "medium"),
+    ("lower_bound", r"Lower Bound", "level", "medium"),
+    ("major_resistance", r"Major Resistance", "level", "medium"),
+    ("major_support", r"Major Support", "level", "medium"),
+    ("pivot", r"Bull/Bear Pivot", "level", "high"),
+    ("value_zone", r"Primary Value Zone", "level", "medium"),
+)
+# One alternation finds every label in a single pass; lastgroup names the label that matched
+_PRICE_LABEL_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{label})" for name, label, _, _ in _PRICE_LEVEL_LABELS),
+    re.IGNORECASE,
+)
+# The first price after a label on the same line; the integer part is possessive because handing
+# digits back can never let "\." match, so a failed attempt stops instead of backtracking through the run
+_PRICE_VALUE_PATTERN = re.compile(r"[^\n]*?(\d++\.\d{4,5})")
+_PRICE_LEVEL_RANKS = {name: (rank, category, priority) for rank, (name, _, category, priority) in enumerate(_PRICE_LEVEL_LABELS)}
+
+# Fields shared by every MT5 alert; the None slots keep the JSON key order when filled in
+_ALERT_TEMPLATE = {
+    "symbol": "EURUSD",
+    "price": None,
+    "condition": None,
+    "action": "notification",
+    "enabled": True,
+    "comment": None,
+    "category": None,
+    "priority": None,
+}
+
+# Lookups indexed by "price is above the current price" (False/True)
+_ENTRY_FALLBACK = (("BUY", "ask_below"), ("SELL", "bid_above"))
+_LEVEL_CONDITIONS = ("bid_below", "bid_above")
+_LEVEL_DIRECTIONS = ("below", "above")
+_LEVEL_COMMENTS = {
+    "exit": "Exit level reached {direction} {price} - Consider manual exit",
+    "level": "Key level {direction} {price} - Monitor price action",
+}
+
+class _PriceLevel(NamedTuple):
+    """A price found in a trading plan, before it becomes an MT5 alert."""
+    rank: int
+    price: float
+    text: str
+    category: str
+    priority: str
+
+def extract_mt5_alerts_from_plan(trade_plan_text, current_price, *, generated_at=None):
+    """Extract price levels from trading plan and generate MT5 alerts JSON.
+
+    Batch callers can pass one ``generated_at`` timestamp for every plan instead of formatting the clock per call.
+    """
+    # Keyed by price: the first (highest-priority) label for a level wins
+    alerts = {}
     
     # Helper function to create alert object
     def create_alert(price, condition, comment, category, priority="medium"):
-        return {
-            "symbol": "EURUSD",
-            "price": float(price),
-            "condition": condition,
-            "action": "notification",
-            "enabled": True,
-            "comment": comment,
-            "category": category,
-            "priority": priority
-        }
-    
-    # Extract price levels using regex patterns
-    import re
-    
-    # Look for explicit price patterns in the trading plan
-    price_patterns = [
-        (r"Entry.*?(\d+\.\d{4,5})", "entry", "high"),
-        (r"Stop Loss.*?(\d+\.\d{4,5})", "exit", "high"), 
-        (r"Take Profit.*?(\d+\.\d{4,5})", "exit", "high"),
-        (r"TP1.*?(\d+\.\d{4,5})", "exit", "high"),
-        (r"TP2.*?(\d+\.\d{4,5})", "exit", "medium"),
-        (r"Upper Bound.*?(\d+\.\d{4,5})", "level", "medium"),
-        (r"Lower Bound.*?(\d+\.\d{4,5})", "level", "medium"),
-        (r"Major Resistance.*?(\d+\.\d{4,5})", "level", "medium"),
-        (r"Major Support.*?(\d+\.\d{4,5})", "level", "medium"),
-        (r"Bull/Bear Pivot.*?(\d+\.\d{4,5})", "level", "high"),
-        (r"Primary Value Zone.*?(\d+\.\d{4,5})", "level", "medium")
-    ]
-    
-    for pattern, category, priority in price_patterns:
-        matches = re.findall(pattern, trade_plan_text, re.IGNORECASE)
-        for match in matches:
-            try:
-                price_level = float(match)
-
-                # For entry levels, determine trade direction from context
-                if category == "entry":
-                    # Find the position of the matched price in the text
-                    match_pos = trade_plan_text.lower().find(str(match).lower())
-                    # Look at a window of text around the match to find 'buy' or 'sell'
-                    window = 40  # characters before and after
-                    start = max(0, match_pos - window)
-                    end = min(len(trade_plan_text), match_pos + window)
-                    context_snippet = trade_plan_text[start:end].lower()
-                    if "buy" in context_snippet:
-                        trade_direction = "BUY"
-                        condition = "ask_below"
-                    elif "sell" in context_snippet:
-                        trade_direction = "SELL"
-                        condition = "bid_above"
-                    else:
-                        # Fallback: infer from price vs current price
-                        if price_level > current_price:
-                            trade_direction = "SELL"
-                            condition = "bid_above"
-                        else:
-                            trade_direction = "BUY"
-                            condition = "ask_below"
-                    direction = trade_direction.lower()
-                    comment = f"Entry level ({trade_direction}) reached at {price_level} - Consider manual entry"
-                else:
-                    # Determine alert condition based on current price for non-entry
-                    if price_level > current_price:
-                        condition = "bid_above"
-                        direction = "above"
-                    else:
-                        condition = "bid_below"
-                        direction = "below"
-                    if category == "exit":
-                        comment = f"Exit level reached {direction} {price_level} - Consider manual exit"
-                    else:
-                        comment = f"Key level {direction} {price_level} - Monitor price action"
+        alert = _ALERT_TEMPLATE.copy()
+        alert["price"] = price  # already parsed once when the level was matched
+        alert["condition"] = condition
+        alert["comment"] = comment
+        alert["category"] = category
+        alert["priority"] = priority
+        return alert
+    
+    # Collect every candidate level first so the price comparison runs as one vectorized pass
+    records = []
+    # A label inside the span of an earlier match for the same label is skipped, as a per-label findall would
+    resume_at = {}
+    for label_match in _PRICE_LABEL_PATTERN.finditer(trade_plan_text):
+        name = label_match.lastgroup
+        if label_match.start() < resume_at.get(name, 0):
+            continue
+        value_match = _PRICE_VALUE_PATTERN.match(trade_plan_text, label_match.end())
+        if value_match is None:
+            continue
+        resume_at[name] = value_match.end()
+        rank, category, priority = _PRICE_LEVEL_RANKS[name]
+        match = value_match.group(1)
+        records.append(_PriceLevel(rank, float(match), match, category, priority))
+    # Order by label priority (stable, so text order within a label) so de-duplication keeps the strongest label
+    records.sort(key=attrgetter("rank"))
+    
+    prices = np.fromiter((record.price for record in records), dtype=np.float64, count=len(records))
+    above_current = (prices > current_price).tolist()
+    # A stable argsort visits levels in price order while keeping the label priority for equal prices,
+    # so alerts are inserted already sorted
+    price_order = np.argsort(prices, kind="stable").tolist()
+    
+    for index in price_order:
+        _, price_level, match, category, priority = records[index]
+        above = above_current[index]
+        if price_level in alerts:
+            continue
+        # For entry levels, determine trade direction from context
+        if category == "entry":
+            # Find the position of the matched price in the text
+            match_pos = trade_plan_text.lower().find(str(match).lower())
+            # Look at a window of text around the match to find 'buy' or 'sell'
+            window = 40  # characters before and after
+            start = max(0, match_pos - window)
+            end = min(len(trade_plan_text), match_pos + window)
+            context_snippet = trade_plan_text[start:end].lower()
+            if "buy" in context_snippet:
+                trade_direction = "BUY"
+                condition = "ask_below"
+            elif "sell" in context_snippet:
+                trade_direction = "SELL"
+                condition = "bid_above"
+            else:
+                # Fallback: infer from price vs current price
+                trade_direction, condition = _ENTRY_FALLBACK[above]
+            comment = f"Entry level ({trade_direction}) reached at {price_level} - Consider manual entry"
+        else:
+            # Determine alert condition based on current price for non-entry
+            condition = _LEVEL_CONDITIONS[above]
+            comment = _LEVEL_COMMENTS[category].format(direction=_LEVEL_DIRECTIONS[above], price=price_level)
 
-                alerts.append(create_alert(price_level, condition, comment, category, priority))
-            except ValueError:
-                continue
+        alerts[price_level] = create_alert(price_level, condition, comment, category, priority)
     
-    # Remove duplicates based on price level
-    seen_prices = set()
-    unique_alerts = []
-    for alert in alerts:
-        if alert["price"] not in seen_prices:
-            seen_prices.add(alert["price"])
-            unique_alerts.append(alert)
-    
-    # Sort alerts by price level
-    unique_alerts.sort(key=lambda x: x["price"])
+    unique_alerts = list(alerts.values())
     
     return {
         "alerts": unique_alerts,
         "metadata": {
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": generated_at or datetime.now(timezone.utc).isoformat(),
             "symbol": "EURUSD",
             "current_price": current_price,
             "total_alerts": len(unique_alerts)
@@ -2633,8 +2775,17 @@ def run_viper_coil(viper_packet):
     
     # --- Step 2: Engage the Planner ---
     print("\n--- STAGE 2: ENGAGING PLANNER LLM ---")
-    planner_user_prompt = f"Here is the latest data packet. Generate the trading playbook.\n\n```json\n{json.dumps(viper_packet, indent=2)}\n```"
-    trade_plan_md = call_llm(PLANNER_SYSTEM_PROMPT, planner_user_prompt)
+    # Send the day-stable Yesterday Brief ahead of the live market snapshot
+    temporal_analysis = viper_packet.get("temporalAnalysis")
+    market_packet = {k: v for k, v in viper_packet.items() if k != "temporalAnalysis"}
+    if temporal_analysis:
+        # Market evolution is measured against the live price, so it travels with the market data
+        market_packet["marketEvolution"] = temporal_analysis.get("marketEvolution")
+    planner_messages = build_planner_messages(
+        json.dumps(market_packet, indent=2),
+        prev_session=temporal_analysis,
+    )
+    trade_plan_md = call_planner(planner_messages)
     
     if not trade_plan_md:
         print("❌ Planner failed to generate a plan. Aborting.")
@@ -2662,18 +2813,18 @@ def run_viper_coil(viper_packet):
     {trade_plan_md}
     ```
     """
-    review_output_raw = call_llm(REVIEWER_SYSTEM_PROMPT, reviewer_user_prompt)
+    review_output_raw = call_reviewer(reviewer_user_prompt)
 
     # --- Step 4: Parse Review and Make Final Decision ---
     try:
         # Clean up the review output using the dedicated function
-        cleaned_output = clean_json_output(review_output_raw)
+        cleaned_output = _clean_json_output_cached(review_output_raw)
         
         if not cleaned_output:
             raise ValueError("Empty or invalid output from reviewer")
         
         # Try to parse the JSON
-        review_scores = json.loads(cleaned_output)
+        review_scores = _loads_json(cleaned_output)
         
         # Validate the structure
         if 'planQualityScore' not in review_scores or 'confidenceScore' not in review_scores:
@@ -0,0 +1,22 @@
+"""
+Structured output schemas for GemEx LLM calls.
+
+These models are passed to Gemini as ``response_schema`` so the API enforces the
+output shape, instead of the prompt spelling out a JSON example.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class Score(BaseModel):
+    """A single reviewer score with its rationale."""
+
+    score: int = Field(description="Integer from 1 (worst) to 10 (best)")
+    justification: str = Field(description="Concise rationale for the score")
+
+
+class ReviewerScores(BaseModel):
+    """Reviewer verdict: objective plan quality plus gut-feel confidence."""
+
+    planQualityScore: Score
+    confidenceScore: Score
@@ -12,6 +12,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import subprocess
 import sys
+from collections import Counter
 from typing import Dict, Any, List
 
 # Page configuration
@@ -264,14 +265,13 @@ if page == "Dashboard":
         
         # Simple stats
         col1, col2, col3 = st.columns(3)
+        outcomes = Counter(log.get('execution', {}).get('outcome') for _, log in recent_sessions)
         
         with col1:
-            wins = sum(1 for _, log in recent_sessions if log.get('execution', {}).get('outcome') == 'win')
-            st.metric("Wins", wins)
+            st.metric("Wins", outcomes['win'])
         
         with col2:
-            losses = sum(1 for _, log in recent_sessions if log.get('execution', {}).get('outcome') == 'loss')
-            st.metric("Losses", losses)
+            st.metric("Losses", outcomes['loss'])
         
         with col3:
             total_pips = sum(log.get('execution', {}).get('pnl_pips', 0) for _, log in recent_sessions)
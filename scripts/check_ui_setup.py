@@ -5,9 +5,12 @@ Quick diagnostic script to verify the system is ready for the web UI.
 Run this before launching the UI for the first time.
 """
 
+import importlib.util
 import sys
 import os
-from pathlib import Path
+
+HEAVY = "═" * 60
+LIGHT = "-" * 60
 
 def check_mark(condition):
     return "✅" if condition else "❌"
@@ -15,24 +18,26 @@ def check_mark(condition):
 def warning_mark(condition):
     return "✅" if condition else "⚠️ "
 
-print("═" * 60)
-print("GemEx UI Setup Checker")
-print("═" * 60)
-print()
-
-# Check Python version
-print("🐍 Python Environment")
-print("-" * 60)
-python_version = sys.version_info
-python_ok = python_version.major == 3 and python_version.minor >= 8
-print(f"{check_mark(python_ok)} Python Version: {python_version.major}.{python_version.minor}.{python_version.micro}")
-if not python_ok:
-    print("   ⚠️  Python 3.8+ recommended (3.12+ preferred)")
-print()
-
-# Check dependencies
-print("📦 Required Packages")
-print("-" * 60)
+def _safe_scandir(path):
+    """List a directory's entries, or nothing if it is missing or unreadable (no stat beforehand)."""
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+
+# One scandir per directory; every existence check below is a dict lookup
+_dir_entries = {}
+
+def dir_entries(path):
+    """Map entry names to cached DirEntry objects for a directory (empty if missing)."""
+    if path not in _dir_entries:
+        _dir_entries[path] = {entry.name: entry for entry in _safe_scandir(path)}
+    return _dir_entries[path]
+
+def path_exists(path):
+    parent, _, name = path.rpartition('/')
+    return name in dir_entries(parent or '.')
 
 packages = {
     'streamlit': 'Web UI framework',
@@ -44,40 +49,12 @@ packages = {
     'matplotlib': 'Visualization',
 }
 
-missing_packages = []
-for package, description in packages.items():
-    try:
-        __import__(package)
-        print(f"✅ {package:25} - {description}")
-    except ImportError:
-        print(f"❌ {package:25} - {description} (NOT INSTALLED)")
-        missing_packages.append(package)
-
-if missing_packages:
-    print()
-    print("⚠️  Missing packages detected. Install with:")
-    print("   pip install -r requirements.txt")
-print()
-
-# Check API keys
-print("🔑 API Configuration")
-print("-" * 60)
-gemini_key = os.environ.get("GEMINI_API_KEY")
-telegram_token = os.environ.get("TELEGRAM_BOT_TOKEN")
-telegram_chat = os.environ.get("TELEGRAM_CHAT_ID")
-
-print(f"{check_mark(bool(gemini_key))} GEMINI_API_KEY: {'Configured' if gemini_key else 'Not set'}")
-if not gemini_key:
-    print("   ⚠️  Required for AI features. Set with:")
-    print("      export GEMINI_API_KEY='your_key_here'")
-
-print(f"{warning_mark(bool(telegram_token))} TELEGRAM_BOT_TOKEN: {'Configured' if telegram_token else 'Not set (optional)'}")
-print(f"{warning_mark(bool(telegram_chat))} TELEGRAM_CHAT_ID: {'Configured' if telegram_chat else 'Not set (optional)'}")
-print()
-
-# Check directories
-print("📁 Directory Structure")
-print("-" * 60)
+# (variable, required) - optional variables only get a warning mark
+env_vars = (
+    ('GEMINI_API_KEY', True),
+    ('TELEGRAM_BOT_TOKEN', False),
+    ('TELEGRAM_CHAT_ID', False),
+)
 
 directories = {
     'data': 'Playbook storage',
@@ -86,16 +63,6 @@ directories = {
     'weekly_reflections': 'Weekly analysis',
 }
 
-for dir_path, description in directories.items():
-    exists = Path(dir_path).exists()
-    print(f"{warning_mark(exists)} {dir_path:25} - {description}")
-
-print()
-
-# Check for essential files
-print("📄 Essential Files")
-print("-" * 60)
-
 files = {
     'app.py': 'Web UI application',
     'ace_main.py': 'ACE orchestration',
@@ -104,61 +71,146 @@ files = {
     'requirements.txt': 'Dependencies list',
 }
 
-for file_path, description in files.items():
-    exists = Path(file_path).exists()
-    print(f"{check_mark(exists)} {file_path:25} - {description}")
-
-print()
-
-# Check for existing data
-print("💾 Existing Data")
-print("-" * 60)
-
-playbook_exists = Path('data/playbook.json').exists()
-print(f"{warning_mark(playbook_exists)} Playbook: {'Found' if playbook_exists else 'Not initialized (will be created)'}")
-
-trading_sessions = list(Path('trading_session').glob('*/')) if Path('trading_session').exists() else []
-print(f"{warning_mark(len(trading_sessions) > 0)} Trading Sessions: {len(trading_sessions)} found")
-
-reflections = list(Path('weekly_reflections').glob('*.json')) if Path('weekly_reflections').exists() else []
-print(f"{warning_mark(len(reflections) > 0)} Weekly Reflections: {len(reflections)} found")
-
-print()
-
-# Overall status
-print("═" * 60)
-print("Overall Status")
-print("═" * 60)
-
-critical_ok = python_ok and not missing_packages and Path('app.py').exists()
-functional_ok = critical_ok and bool(gemini_key)
-
-if functional_ok:
-    print("✅ System is fully operational!")
-    print()
-    print("🚀 Launch the UI with:")
-    print("   ./launch_ui.sh")
-    print("   or: streamlit run app.py")
-elif critical_ok:
-    print("⚠️  System is partially operational")
-    print()
-    print("The UI will launch, but AI features require GEMINI_API_KEY")
-    print()
-    print("Set your API key:")
-    print("   export GEMINI_API_KEY='your_key_here'")
-    print()
-    print("Then launch with:")
-    print("   ./launch_ui.sh")
-else:
-    print("❌ System setup incomplete")
-    print()
+# (heading, mark, {path: description}) - missing directories only warn, missing files fail
+SECTIONS = (
+    ("📁 Directory Structure", warning_mark, directories),
+    ("📄 Essential Files", check_mark, files),
+)
+
+def is_installed(package):
+    """Locate a package without executing it (find_spec skips the module's top-level code)."""
+    try:
+        return importlib.util.find_spec(package) is not None
+    except (ImportError, ValueError):
+        # Raised for broken namespace packages or a parent package that is missing
+        return False
+
+def main():
+    """Run every check and print the readiness report."""
+    # Collect the report and write it once instead of one print per line
+    out = []
+
+    def emit(*args):
+        out.append(' '.join(map(str, args)))
+
+    emit(HEAVY)
+    emit("GemEx UI Setup Checker")
+    emit(HEAVY)
+    emit()
+
+    # Check Python version
+    emit("🐍 Python Environment")
+    emit(LIGHT)
+    python_version = sys.version_info
+    python_ok = python_version.major == 3 and python_version.minor >= 8
+    emit(f"{check_mark(python_ok)} Python Version: {python_version.major}.{python_version.minor}.{python_version.micro}")
+    if not python_ok:
+        emit("   ⚠️  Python 3.8+ recommended (3.12+ preferred)")
+    emit()
+
+    # Check dependencies
+    emit("📦 Required Packages")
+    emit(LIGHT)
+
+    package_status = [
+        (package, description, is_installed(package))
+        for package, description in packages.items()
+    ]
+
+    missing_packages = []
+    for package, description, ok in package_status:
+        if ok:
+            emit(f"✅ {package:25} - {description}")
+        else:
+            emit(f"❌ {package:25} - {description} (NOT INSTALLED)")
+            missing_packages.append(package)
+
     if missing_packages:
-        print("Install missing packages:")
-        print("   pip install -r requirements.txt")
-    if not Path('app.py').exists():
-        print("Missing essential files. Please verify your installation.")
-
-print()
-print("═" * 60)
-print("📖 For more help, see UI_GUIDE.md")
-print("═" * 60)
+        emit()
+        emit("⚠️  Missing packages detected. Install with:")
+        emit("   pip install -r requirements.txt")
+    emit()
+
+    # Check API keys
+    emit("🔑 API Configuration")
+    emit(LIGHT)
+    configured = {}
+    for name, required in env_vars:
+        configured[name] = bool(os.environ.get(name))
+        mark = check_mark if required else warning_mark
+        status = 'Configured' if configured[name] else ('Not set' if required else 'Not set (optional)')
+        emit(f"{mark(configured[name])} {name}: {status}")
+        if required and not configured[name]:
+            emit("   ⚠️  Required for AI features. Set with:")
+            emit(f"      export {name}='your_key_here'")
+    gemini_key = configured['GEMINI_API_KEY']
+    emit()
+
+    # Check directories and essential files
+    for title, mark, paths in SECTIONS:
+        emit(title)
+        emit(LIGHT)
+        for path, description in paths.items():
+            emit(f"{mark(path_exists(path))} {path:25} - {description}")
+        emit()
+
+    # Check for existing data
+    emit("💾 Existing Data")
+    emit(LIGHT)
+
+    playbook_exists = path_exists('data/playbook.json')
+    emit(f"{warning_mark(playbook_exists)} Playbook: {'Found' if playbook_exists else 'Not initialized (will be created)'}")
+
+    trading_sessions = [entry for entry in dir_entries('trading_session').values() if entry.is_dir()]
+    emit(f"{warning_mark(len(trading_sessions) > 0)} Trading Sessions: {len(trading_sessions)} found")
+
+    reflection_count = sum(
+        1 for entry in dir_entries('weekly_reflections').values()
+        if entry.name.endswith('.json') and entry.is_file()
+    )
+    emit(f"{warning_mark(reflection_count > 0)} Weekly Reflections: {reflection_count} found")
+
+    emit()
+
+    # Overall status
+    emit(HEAVY)
+    emit("Overall Status")
+    emit(HEAVY)
+
+    critical_ok = python_ok and not missing_packages and path_exists('app.py')
+    functional_ok = critical_ok and gemini_key
+
+    if functional_ok:
+        emit("✅ System is fully operational!")
+        emit()
+        emit("🚀 Launch the UI with:")
+        emit("   ./launch_ui.sh")
+        emit("   or: streamlit run app.py")
+    elif critical_ok:
+        emit("⚠️  System is partially operational")
+        emit()
+        emit("The UI will launch, but AI features require GEMINI_API_KEY")
+        emit()
+        emit("Set your API key:")
+        emit("   export GEMINI_API_KEY='your_key_here'")
+        emit()
+        emit("Then launch with:")
+        emit("   ./launch_ui.sh")
+    else:
+        emit("❌ System setup incomplete")
+        emit()
+        if missing_packages:
+            emit("Install missing packages:")
+            emit("   pip install -r requirements.txt")
+        if not path_exists('app.py'):
+            emit("Missing essential files. Please verify your installation.")
+
+    emit()
+    emit(HEAVY)
+    emit("📖 For more help, see UI_GUIDE.md")
+    emit(HEAVY)
+
+    sys.stdout.write('\n'.join(out) + '\n')
+
+if __name__ == "__main__":
+    main()
@@ -25,28 +25,17 @@ print("\n" + "="*60 + "\n")
 plan_text = text.strip()
 
 if plan_text.startswith("```"):
-    parts = plan_text.split("```")
-    print(f"Split produced {len(parts)} parts")
-    
-    if len(parts) >= 3:
-        print("Using parts[1] (len >= 3)")
-        plan_text = parts[1].strip()
-    elif len(parts) >= 2:
-        print("Using parts[1] (len >= 2)")
-        plan_text = parts[1].strip()
-    else:
-        print("Removing first 3 chars")
-        plan_text = plan_text[3:].strip()
-    
+    # Slice between the opening fence and the next one - no split() list of every segment
+    end = plan_text.find("```", 3)
+    print(f"Closing fence at index {end}")
+    plan_text = plan_text[3:end if end != -1 else None].strip()
+
     # Remove language identifier
-    if plan_text.startswith("json"):
-        plan_text = plan_text[4:].strip()
-    elif plan_text.startswith("JSON"):
+    if plan_text[:4].lower() == "json":
         plan_text = plan_text[4:].strip()
 
 # Remove trailing ```
-if plan_text.endswith("```"):
-    plan_text = plan_text[:-3].strip()
+plan_text = plan_text.removesuffix("```").strip()
 
 print("\nFinal cleaned text:")
 print(plan_text)
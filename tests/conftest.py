@@ -0,0 +1,14 @@
+"""
+Shared pytest setup
+
+Puts the repository root on sys.path once per session so test modules
+without their own path setup (e.g. test_persistence.py) can import the
+gemex package and the root-level shims.
+"""
+
+import sys
+from pathlib import Path
+
+_ROOT = str(Path(__file__).parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
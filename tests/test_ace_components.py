@@ -8,6 +8,7 @@ import json
 import os
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -28,6 +29,9 @@ from gemex.ace.components import (
     TRADING_SESSIONS_DIR
 )
 
+# Separator lines for the console report
+_BAR60 = "=" * 60
+
 
 def test_initialize_playbook():
     """Test playbook initialization."""
@@ -229,6 +233,47 @@ def test_curator_prune_harmful():
     print("✅ test_curator_prune_harmful passed")
 
 
+def test_curator_prune_large_section():
+    """Test that the vectorized prune path keeps the same harmful > helpful + 2 rule."""
+    
+    playbook = initialize_playbook()
+    section = playbook["sections"]["strategies_and_hard_rules"]
+    for i in range(600):
+        section.append({
+            "id": f"bulk-{i}",
+            "content": "Bulk rule",
+            "helpful_count": i % 4,
+            "harmful_count": i % 7,
+            "created_at": datetime.now().isoformat(),
+            "last_used": None
+        })
+    playbook["metadata"]["total_bullets"] += 600
+    expected = [b["id"] for b in section if b["harmful_count"] <= b["helpful_count"] + 2]
+    
+    reflection = {"week_ending": "2025-01-05", "summary": {}, "insights": [], "recommendations": []}
+    updated_playbook = run_curator(reflection, playbook)
+    
+    kept = [b["id"] for b in updated_playbook["sections"]["strategies_and_hard_rules"]]
+    assert kept == expected
+    assert updated_playbook["metadata"]["total_bullets"] == 5 + len(expected) - 3
+    
+    print("✅ test_curator_prune_large_section passed")
+
+
+def test_curator_version_rollover():
+    """Test that the curator bumps the version by a tenth and rolls 1.9 over to 2.0."""
+    
+    reflection = {"week_ending": "2025-01-05", "summary": {}, "insights": [], "recommendations": []}
+    playbook = initialize_playbook()
+    
+    assert run_curator(reflection, playbook)["metadata"]["version"] == "1.1"
+    
+    playbook["metadata"]["version"] = "1.9"
+    assert run_curator(reflection, playbook)["metadata"]["version"] == "2.0"
+    
+    print("✅ test_curator_version_rollover passed")
+
+
 def test_update_bullet_usage():
     """Test updating bullet usage timestamp."""
     
@@ -247,11 +292,22 @@ def test_update_bullet_usage():
     print("✅ test_update_bullet_usage passed")
 
 
+def _run_one(test):
+    """Run a single test and return its failure line, or None if it passed."""
+    try:
+        test()
+    except AssertionError as e:
+        return f"❌ {test.__name__} failed: {e}"
+    except Exception as e:
+        return f"❌ {test.__name__} error: {e}"
+    return None
+
+
 def run_all_tests():
     """Run all tests."""
-    print("\n" + "=" * 60)
+    print("\n" + _BAR60)
     print("Running ACE Component Tests")
-    print("=" * 60 + "\n")
+    print(_BAR60 + "\n")
     
     tests = [
         test_initialize_playbook,
@@ -261,30 +317,26 @@ def run_all_tests():
         test_curator_add_bullet,
         test_curator_increment_counts,
         test_curator_prune_harmful,
+        test_curator_prune_large_section,
+        test_curator_version_rollover,
         test_update_bullet_usage,
     ]
     
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except AssertionError as e:
-            print(f"❌ {test.__name__} failed: {e}")
-            failed += 1
-        except Exception as e:
-            print(f"❌ {test.__name__} error: {e}")
-            failed += 1
-    
-    print("\n" + "=" * 60)
+    # Each test builds its own in-memory playbook, so they can run side by side
+    with ThreadPoolExecutor(max_workers=min(len(tests), os.cpu_count() or 1)) as executor:
+        failures = [result for result in executor.map(_run_one, tests) if result]
+    
+    for failure in failures:
+        print(failure)
+    passed = len(tests) - len(failures)
+    failed = len(failures)
+    
+    print("\n" + _BAR60)
     print(f"Test Results: {passed} passed, {failed} failed")
-    print("=" * 60)
+    print(_BAR60)
     
     return failed == 0
 
-
 if __name__ == "__main__":
     success = run_all_tests()
     sys.exit(0 if success else 1)
@@ -17,6 +17,10 @@ import json
 import os
 import sys
 import argparse
+import threading
+import importlib
+from importlib.util import find_spec
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -30,55 +34,85 @@ from gemex.ace.components import (
     simulate_trade_execution,
     run_curator,
     save_trade_log,
+    PLAYBOOK_HISTORY_DIR,
     PLAYBOOK_PATH,
     TRADING_SESSIONS_DIR
 )
 
+# Expected playbook sections, trade-log keys and outcomes, built once
+REQUIRED_SECTIONS = ("strategies_and_hard_rules", "useful_code_and_templates", "troubleshooting_and_pitfalls")
+REQUIRED_TRADE_LOG_KEYS = ("plan_id", "execution", "feedback")
+VALID_OUTCOMES = frozenset({"win", "loss", "no_trade"})
+
 
 class TestResults:
     """Track test results."""
-    def __init__(self):
+    __slots__ = ("passed", "failed", "warnings", "tests", "quiet", "_lock")
+    
+    def __init__(self, quiet: bool = False):
         self.passed = 0
         self.failed = 0
         self.warnings = 0
         self.tests = []
+        self.quiet = quiet
+        # Guards the counters and records when tests run in parallel
+        self._lock = threading.Lock()
+    
+    def _record(self, status: str, mark: str, test_name: str, message: str):
+        self.tests.append((status, test_name, message))
+        if not self.quiet:
+            print(f"{mark} {test_name}: {message}")
     
     def add_pass(self, test_name: str, message: str = ""):
-        self.passed += 1
-        self.tests.append(("PASS", test_name, message))
-        print(f"✅ {test_name}: {message}")
+        with self._lock:
+            self.passed += 1
+            self._record("PASS", "✅", test_name, message)
     
     def add_fail(self, test_name: str, message: str = ""):
-        self.failed += 1
-        self.tests.append(("FAIL", test_name, message))
-        print(f"❌ {test_name}: {message}")
+        with self._lock:
+            self.failed += 1
+            self._record("FAIL", "❌", test_name, message)
     
     def add_warning(self, test_name: str, message: str = ""):
-        self.warnings += 1
-        self.tests.append(("WARN", test_name, message))
-        print(f"⚠️  {test_name}: {message}")
+        with self._lock:
+            self.warnings += 1
+            self._record("WARN", "⚠️ ", test_name, message)
     
     def summary(self):
         total = self.passed + self.failed + self.warnings
-        print("\n" + "="*60)
-        print("TEST SUMMARY")
-        print("="*60)
-        print(f"Total Tests: {total}")
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print(f"⚠️  Warnings: {self.warnings}")
-        print("="*60)
+        lines = [
+            "",
+            "=" * 60,
+            "TEST SUMMARY",
+            "=" * 60,
+            f"Total Tests: {total}",
+            f"✅ Passed: {self.passed}",
+            f"❌ Failed: {self.failed}",
+            f"⚠️  Warnings: {self.warnings}",
+            "=" * 60,
+        ]
         
         if self.failed > 0:
-            print("\nFailed tests:")
-            for status, name, msg in self.tests:
-                if status == "FAIL":
-                    print(f"  • {name}: {msg}")
+            lines.append("\nFailed tests:")
+            lines.extend(f"  • {name}: {msg}" for status, name, msg in self.tests if status == "FAIL")
         
+        # One write for the whole block instead of a flush per line
+        sys.stdout.write("\n".join(lines) + "\n")
         return self.failed == 0
 
 
-def test_environment(results: TestResults):
+def _dependency_available(dep_name: str, full: bool = False) -> bool:
+    """Check a dependency by locating its spec, or by importing it when ``full`` is set."""
+    try:
+        if full:
+            importlib.import_module(dep_name)
+            return True
+        return find_spec(dep_name) is not None
+    except ImportError:
+        return False
+
+
+def test_environment(results: TestResults, full: bool = False):
     """Test 1: Environment setup."""
     print("\n" + "="*60)
     print("TEST 1: Environment Setup")
@@ -92,22 +126,12 @@ def test_environment(results: TestResults):
         results.add_warning("Python version", f"{version.major}.{version.minor} (recommend 3.12+)")
     
     # Check core dependencies
-    core_deps = {
-        'pandas': 'pd',
-        'numpy': 'np',
-        'requests': 'requests',
-        'yfinance': 'yf',
-        'google.generativeai': 'genai'
-    }
+    core_deps = ('pandas', 'numpy', 'requests', 'yfinance', 'google.generativeai')
     
-    for dep_name, import_as in core_deps.items():
-        try:
-            if import_as:
-                exec(f"import {dep_name} as {import_as}")
-            else:
-                exec(f"import {dep_name}")
+    for dep_name in core_deps:
+        if _dependency_available(dep_name, full):
             results.add_pass(f"Import {dep_name}", "Available")
-        except ImportError:
+        else:
             results.add_fail(f"Import {dep_name}", "Not available")
     
     # Check API key
@@ -135,13 +159,7 @@ def test_playbook_initialization(results: TestResults):
         return
     
     # Check sections
-    required_sections = [
-        "strategies_and_hard_rules",
-        "useful_code_and_templates",
-        "troubleshooting_and_pitfalls"
-    ]
-    
-    for section in required_sections:
+    for section in REQUIRED_SECTIONS:
         if section in playbook["sections"]:
             count = len(playbook["sections"][section])
             results.add_pass(f"Section: {section}", f"{count} bullets")
@@ -162,9 +180,12 @@ def test_trade_simulation(results: TestResults):
     print("TEST 3: Trade Execution Simulation")
     print("="*60)
     
+    # Both plans share today's UTC date
+    today = datetime.now(timezone.utc).date().isoformat()
+    
     # Create sample bullish plan
     bullish_plan = {
-        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "date": today,
         "bias": "bullish",
         "entry_zone": [1.0500, 1.0510],
         "stop_loss": 1.0480,
@@ -179,8 +200,7 @@ def test_trade_simulation(results: TestResults):
     trade_log = simulate_trade_execution(bullish_plan)
     
     # Check trade log structure
-    required_keys = ["plan_id", "execution", "feedback"]
-    for key in required_keys:
+    for key in REQUIRED_TRADE_LOG_KEYS:
         if key in trade_log:
             results.add_pass(f"Trade log: {key}", "Present")
         else:
@@ -189,14 +209,14 @@ def test_trade_simulation(results: TestResults):
     # Check execution details
     if trade_log.get("execution"):
         execution = trade_log["execution"]
-        if execution.get("outcome") in ["win", "loss", "no_trade"]:
+        if execution.get("outcome") in VALID_OUTCOMES:
             results.add_pass("Trade outcome", execution["outcome"])
         else:
             results.add_warning("Trade outcome", "Unknown outcome")
     
     # Test neutral plan (no trade)
     neutral_plan = {
-        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "date": today,
         "bias": "neutral",
         "confidence": "low",
         "playbook_bullets_used": []
@@ -258,7 +278,9 @@ def test_curator_operations(results: TestResults):
         results.add_fail("Curator: Add bullet", "No bullet added")
     
     # Check version increment
-    if float(updated_playbook["metadata"]["version"]) > float(playbook["metadata"]["version"]):
+    old_version = tuple(map(int, playbook["metadata"]["version"].split(".")))
+    new_version = tuple(map(int, updated_playbook["metadata"]["version"].split(".")))
+    if new_version > old_version:
         results.add_pass("Curator: Version increment", 
                         f"{playbook['metadata']['version']} → {updated_playbook['metadata']['version']}")
     else:
@@ -271,8 +293,8 @@ def test_file_persistence(results: TestResults):
     print("TEST 5: File Persistence")
     print("="*60)
     
-    # Ensure data directory exists
-    Path("data").mkdir(exist_ok=True)
+    # Create the playbook directory (and data/ above it) in one call
+    PLAYBOOK_HISTORY_DIR.mkdir(parents=True, exist_ok=True)
     
     # Create and save test playbook
     playbook = initialize_playbook()
@@ -314,13 +336,13 @@ def test_directory_structure(results: TestResults):
     }
     
     for dir_path, description in required_dirs.items():
-        path = Path(dir_path)
-        path.mkdir(parents=True, exist_ok=True)
-        
-        if path.exists() and path.is_dir():
-            results.add_pass(f"Directory: {dir_path}", description)
+        # mkdir(exist_ok=True) only returns once the directory exists, so no stat is needed
+        try:
+            Path(dir_path).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            results.add_fail(f"Directory: {dir_path}", f"Failed to create: {e}")
         else:
-            results.add_fail(f"Directory: {dir_path}", "Failed to create")
+            results.add_pass(f"Directory: {dir_path}", description)
 
 
 def main():
@@ -328,21 +350,37 @@ def main():
     parser = argparse.ArgumentParser(description="Test ACE trading system")
     parser.add_argument("--with-api", action="store_true", 
                        help="Run tests that require API access")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                       help="Only print section headers and the summary")
+    parser.add_argument("--full", action="store_true",
+                       help="Import each core dependency instead of only locating it")
+    parser.add_argument("--parallel", action="store_true",
+                       help="Run the test groups concurrently (combine with -q for readable output)")
     args = parser.parse_args()
     
     print("╔════════════════════════════════════════════════════════════╗")
     print("║       ACE TRADING SYSTEM - COMPREHENSIVE TEST SUITE        ║")
     print("╚════════════════════════════════════════════════════════════╝")
     
-    results = TestResults()
+    results = TestResults(quiet=args.quiet)
     
     # Run all tests
-    test_environment(results)
-    test_playbook_initialization(results)
-    test_trade_simulation(results)
-    test_curator_operations(results)
-    test_file_persistence(results)
-    test_directory_structure(results)
+    tests = (
+        lambda r: test_environment(r, full=args.full),
+        test_playbook_initialization,
+        test_trade_simulation,
+        test_curator_operations,
+        test_file_persistence,
+        test_directory_structure,
+    )
+    if args.parallel:
+        # The groups touch disjoint state; result() re-raises anything a group threw
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            for future in [executor.submit(test, results) for test in tests]:
+                future.result()
+    else:
+        for test in tests:
+            test(results)
     
     # Print summary
     success = results.summary()
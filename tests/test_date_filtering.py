@@ -4,22 +4,42 @@ Unit tests for date filtering logic in GitHub Actions (Linux environment).
 This ensures that the date string format matches the calendar_df format exactly.
 """
 
+import sys
 import unittest
 from datetime import datetime, timezone
-import pandas as pd
+from pathlib import Path
 import platform
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemex.market_planner import format_calendar_date
+
+_SYSTEM = platform.system()
+
+# (date, expected) pairs for the single-digit day checks
+_SINGLE_DIGIT_CASES = (
+    (datetime(2024, 1, 1, tzinfo=timezone.utc), "Mon Jan 1"),   # New Year
+    (datetime(2024, 1, 9, tzinfo=timezone.utc), "Tue Jan 9"),   # Single digit < 10
+    (datetime(2024, 12, 5, tzinfo=timezone.utc), "Thu Dec 5"),  # Different month
+)
+
 
 class TestDateFiltering(unittest.TestCase):
     """Test cases for date filtering logic."""
     
+    @classmethod
+    def setUpClass(cls):
+        # September 3rd as mentioned in the issue, formatted once for every test
+        cls.SEP3 = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
+        cls.SEP3_STR = format_calendar_date(cls.SEP3)
+    
     def test_linux_date_format_matches_calendar_data(self):
-        """Test that strftime('%a %b %-d') matches the format in calendar_df['Date'] column."""
-        # Test case for September 3rd as mentioned in the issue
-        test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
+        """Test that the formatted date matches the format in calendar_df['Date'] column."""
+        date_str = self.SEP3_STR
         
-        # Use Linux-friendly directive (what should be used in GitHub Actions)
-        date_str = test_date.strftime('%a %b %-d')
+        # Same result as the Linux-only strftime directive it replaces
+        self.assertEqual(date_str, self.SEP3.strftime('%a %b %-d'))
         
         # This should produce "Tue Sep 3" for September 3, 2024
         # (Note: Sep 3, 2024 is actually Tuesday, not Wednesday as mentioned in example)
@@ -36,10 +56,10 @@ class TestDateFiltering(unittest.TestCase):
         
     def test_date_format_no_extra_spacing(self):
         """Test that date format fails if extra spacing is introduced."""
-        test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
+        test_date = self.SEP3
         
         # Correct format
-        correct_format = test_date.strftime('%a %b %-d')
+        correct_format = self.SEP3_STR
         
         # Formats that should NOT match
         bad_formats = [
@@ -54,6 +74,8 @@ class TestDateFiltering(unittest.TestCase):
     
     def test_calendar_data_filtering_simulation(self):
         """Test filtering logic with simulated calendar data."""
+        import pandas as pd
+        
         # Create sample calendar data similar to what Forex Factory might provide
         calendar_data = {
             'Date': [
@@ -74,12 +96,13 @@ class TestDateFiltering(unittest.TestCase):
         }
         
         calendar_df = pd.DataFrame(calendar_data)
+        calendar_df['Date'] = pd.Categorical(calendar_df['Date'])
         
         # Test date filtering for September 3, 2024
-        test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
-        today_str = test_date.strftime('%a %b %-d')  # Should be "Tue Sep 3"
+        today_str = self.SEP3_STR  # Should be "Tue Sep 3"
         
-        # Filter for today's events
+        # Filter for today's events (exact match, as the scraper does)
+        self.assertIsInstance(calendar_df['Date'].dtype, pd.CategoricalDtype)
         todays_events = calendar_df[calendar_df['Date'] == today_str]
         
         # Should find exactly 1 matching row
@@ -93,6 +116,8 @@ class TestDateFiltering(unittest.TestCase):
         
     def test_high_impact_event_filtering(self):
         """Test filtering for high-impact events similar to row 59 example."""
+        import pandas as pd
+        
         # Simulate the row 59 example: "Wed Sep 3 | USD | High Impact Expected"
         # Note: Using "Tue Sep 3" since Sep 3, 2024 is actually Tuesday
         calendar_data = {
@@ -105,15 +130,13 @@ class TestDateFiltering(unittest.TestCase):
         calendar_df = pd.DataFrame(calendar_data)
         
         # Test filtering for September 3rd
-        test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
-        today_str = test_date.strftime('%a %b %-d')
+        today_str = self.SEP3_STR
         
         # Filter for today's high-impact USD events
-        high_impact_events = calendar_df[
-            (calendar_df['Date'] == today_str) & 
-            (calendar_df['Currency'] == 'USD') &
-            (calendar_df['Impact'].str.contains('High Impact', na=False))
-        ]
+        date_mask = calendar_df['Date'].eq(today_str)
+        usd_mask = calendar_df['Currency'].eq('USD')
+        impact_mask = calendar_df['Impact'].str.contains('High Impact', regex=False, na=False)
+        high_impact_events = calendar_df[date_mask & usd_mask & impact_mask]
         
         # Should find the high-impact event
         self.assertEqual(len(high_impact_events), 1)
@@ -125,19 +148,14 @@ class TestDateFiltering(unittest.TestCase):
     def test_linux_environment_assumption(self):
         """Test that we're running in a Linux environment (as GitHub Actions does)."""
         # Since GitHub Actions uses Linux runners by default, verify we're testing in the right environment
-        self.assertEqual(platform.system(), 'Linux', 
+        self.assertEqual(_SYSTEM, 'Linux', 
                         "Tests should run in Linux environment to match GitHub Actions")
         
     def test_edge_case_single_digit_days(self):
         """Test edge cases with single-digit days to ensure no leading zeros."""
-        test_dates = [
-            datetime(2024, 1, 1, tzinfo=timezone.utc),   # New Year
-            datetime(2024, 1, 9, tzinfo=timezone.utc),   # Single digit < 10
-            datetime(2024, 12, 5, tzinfo=timezone.utc),  # Different month
-        ]
-        
-        for test_date in test_dates:
-            date_str = test_date.strftime('%a %b %-d')
+        for test_date, expected in _SINGLE_DIGIT_CASES:
+            date_str = format_calendar_date(test_date)
+            self.assertEqual(date_str, expected)
             
             # Should not contain leading zeros
             parts = date_str.split()
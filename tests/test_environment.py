@@ -6,8 +6,17 @@ This can be used to test basic functionality when pip install fails.
 
 import sys
 import os
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
 from pathlib import Path
 
+def _available(dep):
+    """Locate a module without executing it (a missing parent package counts as absent)."""
+    try:
+        return find_spec(dep) is not None
+    except ImportError:
+        return False
+
 def test_environment():
     """Test basic environment setup."""
     print("=== GemEx Environment Test ===")
@@ -18,23 +27,16 @@ def test_environment():
     # Test working directory
     print(f"✓ Working directory: {os.getcwd()}")
     
-    # Test basic imports
-    try:
-        import pandas as pd
-        print(f"✓ pandas available: {pd.__version__}")
-    except ImportError:
-        print("✗ pandas not available")
-    
-    try:
-        import numpy as np
-        print(f"✓ numpy available: {np.__version__}")
-    except ImportError:
-        print("✗ numpy not available")
+    # Test basic imports (versions come from package metadata, so nothing is imported)
+    for dep in ('pandas', 'numpy'):
+        try:
+            print(f"✓ {dep} available: {version(dep)}")
+        except PackageNotFoundError:
+            print(f"✗ {dep} not available")
     
-    try:
-        import requests
+    if _available('requests'):
         print("✓ requests available")
-    except ImportError:
+    else:
         print("✗ requests not available")
     
     # Test optional dependencies
@@ -43,11 +45,7 @@ def test_environment():
     missing_optional = []
     
     for dep in optional_deps:
-        try:
-            __import__(dep)
-            available_optional.append(dep)
-        except ImportError:
-            missing_optional.append(dep)
+        (available_optional if _available(dep) else missing_optional).append(dep)
     
     if available_optional:
         print(f"✓ Optional dependencies available: {', '.join(available_optional)}")
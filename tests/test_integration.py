@@ -1,20 +1,25 @@
 #!/usr/bin/env python3
 """
 Integration test to verify the updated market_planner.py date filtering logic works correctly.
-This test validates the core date formatting logic without requiring external dependencies.
+This test validates market_planner.format_calendar_date and the calendar filtering built on it.
 """
 
 import sys
 import os
 from datetime import datetime, timezone
-import pandas as pd
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemex.market_planner import format_calendar_date
 
 def test_date_formatting_logic_directly():
     """Test the core date filtering logic that's now in market_planner.py."""
     print("=== Testing Core Date Logic ===")
     
     # Test the exact logic that's now in market_planner.py
-    today_str = datetime.now(timezone.utc).strftime('%a %b %-d')
+    today_str = format_calendar_date(datetime.now(timezone.utc))
     print(f"Current date string: '{today_str}'")
     
     # Verify format components
@@ -46,7 +51,7 @@ def test_specific_date_examples():
     ]
     
     for test_date, expected in test_cases:
-        result = test_date.strftime('%a %b %-d')
+        result = format_calendar_date(test_date)
         print(f"Date: {test_date.date()} -> '{result}' (expected: '{expected}')")
         assert result == expected, f"Expected '{expected}', got '{result}'"
     
@@ -70,18 +75,20 @@ def test_calendar_filtering_simulation():
         'Event': ['FOMC Meeting', 'ECB Decision', 'GDP Data', 'BoE Meeting']
     }
     
-    calendar_df = pd.DataFrame(calendar_data)
+    # Four rows: plain dicts and a comprehension beat DataFrame setup at this size
+    rows = [dict(zip(calendar_data, values)) for values in zip(*calendar_data.values())]
     print("Sample calendar data:")
-    print(calendar_df)
+    for row in rows:
+        print(row)
     
     # Test filtering for September 3, 2024
     test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
-    today_str = test_date.strftime('%a %b %-d')  # Should be "Tue Sep 3"
+    today_str = format_calendar_date(test_date)  # Should be "Tue Sep 3"
     
     print(f"\nFiltering for: '{today_str}'")
     
     # Filter for today's events (exact match)
-    todays_events = calendar_df[calendar_df['Date'] == today_str]
+    todays_events = [row for row in rows if row['Date'] == today_str]
     print(f"Found {len(todays_events)} events for today:")
     print(todays_events)
     
@@ -89,7 +96,7 @@ def test_calendar_filtering_simulation():
     assert len(todays_events) == 1, f"Expected 1 event, found {len(todays_events)}"
     
     # Check it's the right event
-    event = todays_events.iloc[0]
+    event = todays_events[0]
     assert event['Date'] == 'Tue Sep 3'
     assert event['Currency'] == 'USD'
     assert 'High Impact' in event['Impact']
@@ -109,18 +116,17 @@ def test_high_impact_event_filtering():
         'Event': ['FOMC Meeting', 'ECB Decision', 'GDP Data', 'EU Inflation']
     }
     
-    calendar_df = pd.DataFrame(calendar_data)
+    rows = [dict(zip(calendar_data, values)) for values in zip(*calendar_data.values())]
     
     # Filter for September 3rd high-impact USD events
     test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
-    today_str = test_date.strftime('%a %b %-d')
+    today_str = format_calendar_date(test_date)
     
     print(f"Filtering for high-impact USD events on: '{today_str}'")
     
-    high_impact_usd_events = calendar_df[
-        (calendar_df['Date'] == today_str) & 
-        (calendar_df['Currency'] == 'USD') &
-        (calendar_df['Impact'].str.contains('High Impact', na=False))
+    high_impact_usd_events = [
+        row for row in rows
+        if row['Date'] == today_str and row['Currency'] == 'USD' and 'High Impact' in row['Impact']
     ]
     
     print(f"Found {len(high_impact_usd_events)} high-impact USD events:")
@@ -129,7 +135,7 @@ def test_high_impact_event_filtering():
     # Should find exactly 1 high-impact USD event
     assert len(high_impact_usd_events) == 1, f"Expected 1 high-impact USD event, found {len(high_impact_usd_events)}"
     
-    event = high_impact_usd_events.iloc[0]
+    event = high_impact_usd_events[0]
     assert event['Date'] == 'Tue Sep 3'
     assert event['Currency'] == 'USD'
     assert 'High Impact' in event['Impact']
@@ -142,22 +148,22 @@ def test_no_platform_dependency():
     """Test that the date formatting works consistently regardless of platform assumptions."""
     print("\n=== Testing Platform Independence ===")
     
-    # Test that we always use the Linux format (%-d) regardless of platform
+    # Manual formatting needs no platform-specific directive (%-d vs %#d)
     test_date = datetime(2024, 9, 3, 12, 0, 0, tzinfo=timezone.utc)
     
-    # This is the format that should always be used in GitHub Actions (Linux)
-    linux_format = test_date.strftime('%a %b %-d')
-    print(f"Linux format: '{linux_format}'")
+    formatted = format_calendar_date(test_date)
+    print(f"Formatted: '{formatted}'")
     
     # Verify it produces the expected result
-    assert linux_format == "Tue Sep 3", f"Expected 'Tue Sep 3', got '{linux_format}'"
+    assert formatted == "Tue Sep 3", f"Expected 'Tue Sep 3', got '{formatted}'"
     
     # Test edge case with single digit day
     single_digit_date = datetime(2024, 1, 5, 12, 0, 0, tzinfo=timezone.utc)
-    single_digit_result = single_digit_date.strftime('%a %b %-d')
+    single_digit_result = format_calendar_date(single_digit_date)
     print(f"Single digit day: '{single_digit_result}'")
     
     # Should not contain leading zero
+    assert single_digit_result == "Fri Jan 5", f"Expected 'Fri Jan 5', got '{single_digit_result}'"
     assert "05" not in single_digit_result, f"Should not contain '05': {single_digit_result}"
     assert single_digit_result.endswith(" 5"), f"Should end with ' 5': {single_digit_result}"
     
@@ -7,52 +7,40 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from gemex.market_planner import clean_json_output
+from gemex.market_planner import clean_json_output, _clean_json_output_cached
+
+_GOOD_PLAN = '{"planQualityScore": {"score": 8, "justification": "Good plan"}}'
+
+# (raw model output, expected cleaned text), built once at import
+_CLEANING_CASES = (
+    # Case 1: Clean JSON
+    (_GOOD_PLAN, _GOOD_PLAN),
+    # Case 2: JSON with markdown
+    ('```json\n' + _GOOD_PLAN + '\n```', _GOOD_PLAN),
+    # Case 3: JSON with extra text
+    ('Here is the analysis:\n' + _GOOD_PLAN + '\nEnd of analysis.', _GOOD_PLAN),
+    # Case 4: Empty input
+    ('', ''),
+    # Case 5: No JSON
+    ('This is not JSON at all', 'This is not JSON at all'),
+)
 
 def test_json_cleaning():
     """Test the JSON cleaning function with various inputs."""
     print("🧪 Testing JSON cleaning function...")
     
-    test_cases = [
-        # Case 1: Clean JSON
-        {
-            "input": '{"planQualityScore": {"score": 8, "justification": "Good plan"}}',
-            "expected": '{"planQualityScore": {"score": 8, "justification": "Good plan"}}'
-        },
-        # Case 2: JSON with markdown
-        {
-            "input": '```json\n{"planQualityScore": {"score": 8, "justification": "Good plan"}}\n```',
-            "expected": '{"planQualityScore": {"score": 8, "justification": "Good plan"}}'
-        },
-        # Case 3: JSON with extra text
-        {
-            "input": 'Here is the analysis:\n{"planQualityScore": {"score": 8, "justification": "Good plan"}}\nEnd of analysis.',
-            "expected": '{"planQualityScore": {"score": 8, "justification": "Good plan"}}'
-        },
-        # Case 4: Empty input
-        {
-            "input": '',
-            "expected": ''
-        },
-        # Case 5: No JSON
-        {
-            "input": 'This is not JSON at all',
-            "expected": 'This is not JSON at all'
-        }
-    ]
-    
     passed = 0
-    total = len(test_cases)
+    total = len(_CLEANING_CASES)
     
-    for i, test_case in enumerate(test_cases, 1):
-        result = clean_json_output(test_case["input"])
-        if result == test_case["expected"]:
+    for i, (raw, expected) in enumerate(_CLEANING_CASES, 1):
+        result = clean_json_output(raw)
+        if result == expected:
             print(f"✅ Test case {i} passed")
             passed += 1
         else:
             print(f"❌ Test case {i} failed")
-            print(f"   Input: {repr(test_case['input'])}")
-            print(f"   Expected: {repr(test_case['expected'])}")
+            print(f"   Input: {repr(raw)}")
+            print(f"   Expected: {repr(expected)}")
             print(f"   Got: {repr(result)}")
     
     print(f"\n📊 JSON Cleaning Tests: {passed}/{total} passed")
@@ -80,6 +68,22 @@ def test_json_parsing():
         print(f"❌ Valid JSON parsing test failed - JSON decode error: {e}")
         return False
 
+def test_cached_cleaning():
+    """Test that the memoized cleaner matches the uncached one and hits on repeats."""
+    print("\n🧪 Testing cached JSON cleaning...")
+    
+    raw = '```json\n{"planQualityScore": {"score": 8, "justification": "Good plan"}}\n```'
+    _clean_json_output_cached.cache_clear()
+    
+    first = _clean_json_output_cached(raw)
+    second = _clean_json_output_cached(raw)
+    
+    assert first == clean_json_output(raw)
+    assert second == first
+    assert _clean_json_output_cached.cache_info().hits == 1
+    print("✅ Cached cleaning test passed")
+    return True
+
 def main():
     """Run all JSON parsing tests."""
     print("🚀 Starting JSON Parsing Tests")
@@ -87,7 +91,8 @@ def main():
     
     tests = [
         test_json_cleaning,
-        test_json_parsing
+        test_json_parsing,
+        test_cached_cleaning
     ]
     
     passed = 0
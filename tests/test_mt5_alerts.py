@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for MT5 price alert extraction
+
+These tests validate the alerts built from a trading plan without requiring API keys.
+Pass --dump to also write (and preview) the extracted alerts in mt5_alerts_test.json.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemex.market_planner import extract_mt5_alerts_from_plan
+
+SAMPLE_PLAN = """
+## Plan A: Long Setup
+Entry: Buy at 1.08350
+Stop Loss: 1.08150
+Take Profit: 1.08850
+
+## Key Levels
+Major Resistance: 1.09200
+Major Support: 1.07800
+Bull/Bear Pivot: 1.08500
+"""
+
+
+REQUIRED_ALERT_FIELDS = frozenset({'symbol', 'price', 'condition', 'action', 'enabled', 'comment', 'category', 'priority'})
+REQUIRED_METADATA_FIELDS = frozenset({'generated_at', 'symbol', 'current_price', 'total_alerts'})
+VALID_CONDITIONS = frozenset({'bid_above', 'bid_below', 'ask_above', 'ask_below'})
+VALID_CATEGORIES = frozenset({'entry', 'exit', 'level'})
+VALID_PRIORITIES = frozenset({'high', 'medium', 'low'})
+
+
+def validate_alert_structure(alerts_data):
+    """Check the alerts payload has every field the MT5 side expects."""
+    for i, alert in enumerate(alerts_data['alerts']):
+        missing = REQUIRED_ALERT_FIELDS.difference(alert)
+        if missing:
+            print(f"❌ Missing fields in alert {i}: {sorted(missing)}")
+            return False
+        if alert['condition'] not in VALID_CONDITIONS:
+            print(f"❌ Invalid condition in alert {i}: {alert['condition']}")
+            return False
+        if alert['category'] not in VALID_CATEGORIES or alert['priority'] not in VALID_PRIORITIES:
+            print(f"❌ Invalid category/priority in alert {i}: {alert['category']}/{alert['priority']}")
+            return False
+
+    missing = REQUIRED_METADATA_FIELDS.difference(alerts_data['metadata'])
+    if missing:
+        print(f"❌ Missing metadata fields: {sorted(missing)}")
+        return False
+
+    return alerts_data['metadata']['total_alerts'] == len(alerts_data['alerts'])
+
+
+def test_mt5_alerts_extraction():
+    """Test that alerts are extracted, de-duplicated and sorted by price."""
+    alerts_data = extract_mt5_alerts_from_plan(SAMPLE_PLAN, 1.0845)
+    prices = [alert['price'] for alert in alerts_data['alerts']]
+
+    assert validate_alert_structure(alerts_data)
+    assert prices == sorted(set(prices))
+    assert 1.0835 in prices and 1.092 in prices
+
+    entry = next(alert for alert in alerts_data['alerts'] if alert['category'] == 'entry')
+    assert entry['condition'] == 'ask_below'
+
+    batch = extract_mt5_alerts_from_plan(SAMPLE_PLAN, 1.0845, generated_at="2025-01-09T10:00:00+00:00")
+    assert batch['metadata']['generated_at'] == "2025-01-09T10:00:00+00:00"
+
+    print("✅ test_mt5_alerts_extraction passed")
+
+
+def test_mt5_alerts_label_priority():
+    """Test that a price under several labels keeps the highest-priority label."""
+    alerts_data = extract_mt5_alerts_from_plan("Major Support (Entry) 1.0780, Entry buy 1.0790", 1.0845)
+    categories = {alert['price']: alert['category'] for alert in alerts_data['alerts']}
+
+    assert categories == {1.078: 'entry', 1.079: 'entry'}
+
+    print("✅ test_mt5_alerts_label_priority passed")
+
+
+if __name__ == "__main__":
+    print("Running MT5 alert tests...\n")
+
+    test_mt5_alerts_extraction()
+    test_mt5_alerts_label_priority()
+    if "--dump" in sys.argv:
+        # Serialize once; the same string is written and previewed
+        payload = json.dumps(extract_mt5_alerts_from_plan(SAMPLE_PLAN, 1.0845), indent=2)
+        Path("mt5_alerts_test.json").write_text(payload)
+        print(f"📄 Alerts written to mt5_alerts_test.json ({len(payload)} chars)")
+        print(payload[:500] + "..." if len(payload) > 500 else payload)
+
+    print("\n✅ All tests passed!")
@@ -7,8 +7,7 @@ This script tests the ability to download and use previous session data.
 import os
 import sys
 import json
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 # Add the current directory to the path so we can import market_planner
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -16,9 +15,23 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from market_planner import (
     download_previous_session_artifacts,
     create_fallback_previous_context,
-    get_previous_session_analysis
+    get_previous_session_analysis,
+    previous_day_folder
 )
 
+# GitHub Actions environment, read once at import so every check sees the same snapshot
+_IN_GITHUB_ACTIONS = os.environ.get('GITHUB_ACTIONS') is not None
+_GITHUB_REPOSITORY = os.environ.get('GITHUB_REPOSITORY')
+_GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
+
+REQUIRED_CONTEXT_KEYS = frozenset({
+    "previousSessionDate",
+    "previousPlanExists",
+    "previousMarketSnapshot",
+    "previousKeyLevels",
+    "previousPlanOutcome"
+})
+
 def test_fallback_context():
     """Test the fallback context creation."""
     print("🧪 Testing fallback context creation...")
@@ -28,6 +41,8 @@ def test_fallback_context():
     assert context["previousPlanExists"] == False
     assert context["fallbackMode"] == True
     assert "previousSessionDate" in context
+    assert context["previousSessionDate"] == (datetime.now() - timedelta(days=1)).strftime("%Y_%m_%d")
+    assert previous_day_folder(date(2025, 3, 1)) == "2025_02_28"
     
     print("✅ Fallback context test passed")
     return True
@@ -37,17 +52,22 @@ def test_local_session_loading():
     print("🧪 Testing local session loading...")
     
     # Check if we have any local session data
-    trading_session_dir = Path("trading_session")
-    if trading_session_dir.exists():
-        session_dirs = list(trading_session_dir.glob("20*"))
-        if session_dirs:
-            print(f"Found {len(session_dirs)} local session directories")
-            for session_dir in session_dirs:
-                print(f"  - {session_dir.name}")
+    # scandir entries carry the d_type from readdir, so is_dir() needs no extra stat
+    try:
+        with os.scandir("trading_session") as entries:
+            session_names = [
+                entry.name for entry in entries
+                if entry.name.startswith("20") and entry.is_dir(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        print("No trading_session directory found")
+    else:
+        if session_names:
+            print(f"Found {len(session_names)} local session directories")
+            for name in session_names:
+                print(f"  - {name}")
         else:
             print("No local session directories found")
-    else:
-        print("No trading_session directory found")
     
     print("✅ Local session loading test completed")
     return True
@@ -57,15 +77,12 @@ def test_github_actions_detection():
     print("🧪 Testing GitHub Actions environment detection...")
     
     # Check if we're in GitHub Actions
-    in_github_actions = os.environ.get('GITHUB_ACTIONS') is not None
-    print(f"Running in GitHub Actions: {in_github_actions}")
+    print(f"Running in GitHub Actions: {_IN_GITHUB_ACTIONS}")
     
-    if in_github_actions:
+    if _IN_GITHUB_ACTIONS:
         print("GitHub Actions environment detected")
-        github_repo = os.environ.get('GITHUB_REPOSITORY')
-        github_token = os.environ.get('GITHUB_TOKEN')
-        print(f"Repository: {github_repo}")
-        print(f"Token available: {github_token is not None}")
+        print(f"Repository: {_GITHUB_REPOSITORY}")
+        print(f"Token available: {_GITHUB_TOKEN is not None}")
     else:
         print("Local environment detected")
     
@@ -80,16 +97,8 @@ def test_previous_session_analysis():
         context = get_previous_session_analysis()
         
         # Verify the context structure
-        required_keys = [
-            "previousSessionDate",
-            "previousPlanExists",
-            "previousMarketSnapshot",
-            "previousKeyLevels",
-            "previousPlanOutcome"
-        ]
-        
-        for key in required_keys:
-            assert key in context, f"Missing key: {key}"
+        missing = REQUIRED_CONTEXT_KEYS - context.keys()
+        assert not missing, f"Missing keys: {sorted(missing)}"
         
         print(f"Previous session date: {context['previousSessionDate']}")
         print(f"Previous plan exists: {context['previousPlanExists']}")
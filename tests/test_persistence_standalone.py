@@ -10,6 +10,11 @@ import json
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# GitHub Actions environment, read once at import so every check sees the same snapshot
+_IN_GITHUB_ACTIONS = os.environ.get('GITHUB_ACTIONS') is not None
+_GITHUB_REPOSITORY = os.environ.get('GITHUB_REPOSITORY')
+_GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
+
 def test_fallback_context():
     """Test the fallback context creation."""
     print("🧪 Testing fallback context creation...")
@@ -38,15 +43,12 @@ def test_github_actions_detection():
     print("🧪 Testing GitHub Actions environment detection...")
     
     # Check if we're in GitHub Actions
-    in_github_actions = os.environ.get('GITHUB_ACTIONS') is not None
-    print(f"Running in GitHub Actions: {in_github_actions}")
+    print(f"Running in GitHub Actions: {_IN_GITHUB_ACTIONS}")
     
-    if in_github_actions:
+    if _IN_GITHUB_ACTIONS:
         print("GitHub Actions environment detected")
-        github_repo = os.environ.get('GITHUB_REPOSITORY')
-        github_token = os.environ.get('GITHUB_TOKEN')
-        print(f"Repository: {github_repo}")
-        print(f"Token available: {github_token is not None}")
+        print(f"Repository: {_GITHUB_REPOSITORY}")
+        print(f"Token available: {_GITHUB_TOKEN is not None}")
     else:
         print("Local environment detected")
     
@@ -57,17 +59,14 @@ def test_environment_variables():
     """Test that required environment variables are available in GitHub Actions."""
     print("🧪 Testing environment variables...")
     
-    if os.environ.get('GITHUB_ACTIONS'):
+    if _IN_GITHUB_ACTIONS:
         # In GitHub Actions, check for required variables
-        github_repo = os.environ.get('GITHUB_REPOSITORY')
-        github_token = os.environ.get('GITHUB_TOKEN')
-        
-        assert github_repo is not None, "GITHUB_REPOSITORY should be available in GitHub Actions"
-        assert github_token is not None, "GITHUB_TOKEN should be available in GitHub Actions"
+        assert _GITHUB_REPOSITORY is not None, "GITHUB_REPOSITORY should be available in GitHub Actions"
+        assert _GITHUB_TOKEN is not None, "GITHUB_TOKEN should be available in GitHub Actions"
         
         print(f"✅ All required environment variables are available")
-        print(f"   Repository: {github_repo}")
-        print(f"   Token: {'***' if github_token else 'None'}")
+        print(f"   Repository: {_GITHUB_REPOSITORY}")
+        print(f"   Token: {'***' if _GITHUB_TOKEN else 'None'}")
     else:
         print("✅ Local environment - no GitHub-specific variables required")
     
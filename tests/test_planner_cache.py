@@ -0,0 +1,98 @@
+"""
+Tests for the planner response cache
+
+These tests stub the LLM call, so they run without API keys.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemex import market_planner
+from gemex.prompts import build_planner_messages
+
+
+def _stub_planner(monkeypatch):
+    """Replace the LLM call with a counter that returns a new plan per call."""
+    calls = []
+
+    def fake_call_llm_messages(messages, temperature=None, response_schema=None):
+        calls.append(messages)
+        return f"# Plan sample {len(calls)}"
+
+    monkeypatch.setattr(market_planner, "call_llm_messages", fake_call_llm_messages)
+    monkeypatch.setattr(market_planner, "_PLANNER_RESPONSE_CACHE", {})
+    monkeypatch.setattr(market_planner, "_PLANNER_CACHE_CURSORS", {})
+    return calls
+
+
+def test_planner_cache_samples_within_namespace(monkeypatch):
+    """Test that repeated calls in one namespace draw fresh samples."""
+    calls = _stub_planner(monkeypatch)
+    messages = build_planner_messages('{"currentPrice": 1.0850}')
+
+    first = market_planner.call_planner(messages, namespace="eval-a")
+    second = market_planner.call_planner(messages, namespace="eval-a")
+
+    assert first == "# Plan sample 1"
+    assert second == "# Plan sample 2"
+    assert len(calls) == 2
+
+    print("✅ test_planner_cache_samples_within_namespace passed")
+
+
+def test_planner_cache_reuse_across_eval_namespaces(monkeypatch):
+    """Test that eval namespaces replay each other's samples but never production's."""
+    calls = _stub_planner(monkeypatch)
+    messages = build_planner_messages('{"currentPrice": 1.0850}')
+
+    market_planner.call_planner(messages, namespace="eval-a")
+    market_planner.call_planner(messages, namespace="eval-a")
+    replay = [market_planner.call_planner(messages, namespace="eval-b") for _ in range(3)]
+    prod = market_planner.call_planner(messages, namespace="prod")
+
+    assert replay == ["# Plan sample 1", "# Plan sample 2", "# Plan sample 3"]
+    assert prod == "# Plan sample 4"
+    assert len(calls) == 4
+
+    print("✅ test_planner_cache_reuse_across_eval_namespaces passed")
+
+
+def test_planner_cache_key_tracks_prompt(monkeypatch):
+    """Test that a different system prompt never reuses cached plans."""
+    calls = _stub_planner(monkeypatch)
+
+    market_planner.call_planner(build_planner_messages('{"currentPrice": 1.0850}'), namespace="eval-a")
+    market_planner.call_planner(build_planner_messages('{"currentPrice": 1.0850}', include_mt5=False), namespace="eval-b")
+
+    assert len(calls) == 2
+
+    print("✅ test_planner_cache_key_tracks_prompt passed")
+
+
+def test_gemini_model_reused_between_calls(monkeypatch):
+    """Test that planner and reviewer calls share one configured Gemini client."""
+    configured = []
+    monkeypatch.setattr(market_planner, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(market_planner.genai, "configure", lambda **kwargs: configured.append(kwargs))
+    market_planner.configure_gemini.cache_clear()
+    market_planner._configure_genai.cache_clear()
+
+    try:
+        planner_model = market_planner.configure_gemini(system_instruction="planner")
+        assert market_planner.configure_gemini(system_instruction="planner") is planner_model
+        market_planner.configure_gemini(system_instruction="reviewer")
+        assert configured == [{"api_key": "test-key"}]
+    finally:
+        market_planner.configure_gemini.cache_clear()
+        market_planner._configure_genai.cache_clear()
+
+    print("✅ test_gemini_model_reused_between_calls passed")
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,218 @@
+"""
+Tests for prompt construction
+
+These tests validate the planner/reviewer prompt layout without requiring API keys.
+"""
+
+import hashlib
+import importlib
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemex import prompts
+from gemex.prompts import (
+    PLANNER_BRIEF_SEPARATOR,
+    PLANNER_MT5_ADDENDUM,
+    PLANNER_SYSTEM_PROMPT,
+    PLANNER_SYSTEM_PROMPT_SHA256,
+    PLANNER_SYSTEM_PROMPT_STATIC,
+    PLANNER_SYSTEM_PROMPT_V1_LEGACY,
+    REVIEWER_EXAMPLE_OUTPUT,
+    REVIEWER_SYSTEM_PROMPT,
+    REVIEWER_SYSTEM_PROMPT_COMPRESSED,
+    REVIEWER_SYSTEM_PROMPT_SHA256,
+    build_planner_messages,
+    build_planner_prompt,
+    build_reviewer_messages,
+    build_yesterday_brief,
+    get_reviewer_prompt,
+    get_yesterday_brief,
+    render_planner_prompt,
+)
+
+PINNED_PLANNER_SYSTEM_PROMPT_SHA256 = "e46fc6b5172c4f2e6a92d3351cd76316660bffa92f6daa60d0c633fb3eef11c8"
+
+
+def test_planner_messages_static_prefix():
+    """Test that the system message is identical across different market data."""
+    first = build_planner_messages('{"currentPrice": 1.0850}')
+    second = build_planner_messages('{"currentPrice": 1.0900}')
+
+    assert first[0] == {"role": "system", "content": PLANNER_SYSTEM_PROMPT_STATIC}
+    assert first[0] == second[0]
+    assert first[1]["role"] == "user"
+    assert first[1]["content"] != second[1]["content"]
+    assert PLANNER_SYSTEM_PROMPT is PLANNER_SYSTEM_PROMPT_STATIC
+
+    print("✅ test_planner_messages_static_prefix passed")
+
+
+def test_planner_messages_market_data_last():
+    """Test that per-run data only appears in the user message."""
+    messages = build_planner_messages('{"currentPrice": 1.0850}', prev_session={"previousPlanExists": False})
+    user_content = messages[1]["content"]
+
+    assert "1.0850" in user_content
+    assert "YESTERDAY BRIEF" in user_content
+    assert "1.0850" not in messages[0]["content"]
+    assert user_content.index("YESTERDAY BRIEF") < user_content.index(PLANNER_BRIEF_SEPARATOR) < user_content.index("1.0850")
+    assert user_content.endswith("```")
+
+    print("✅ test_planner_messages_market_data_last passed")
+
+
+def test_planner_prompt_variants():
+    """Test that every export is defined once and the prompt variants are normalized."""
+    assert len(prompts.__all__) == len(set(prompts.__all__))
+    assert all(hasattr(prompts, name) for name in prompts.__all__)
+
+    for prompt in (PLANNER_SYSTEM_PROMPT_V1_LEGACY, PLANNER_SYSTEM_PROMPT_STATIC, REVIEWER_SYSTEM_PROMPT):
+        assert prompt == prompt.strip() + "\n"
+        assert all(line == line.rstrip() for line in prompt.splitlines())
+        assert not prompt.startswith(" ")
+
+    print("✅ test_planner_prompt_variants passed")
+
+
+def test_prompt_sha256_identity():
+    """Test that the exported prompt hashes match the prompt bytes."""
+    assert PLANNER_SYSTEM_PROMPT_SHA256 == hashlib.sha256(PLANNER_SYSTEM_PROMPT_STATIC.encode("utf-8")).hexdigest()
+    assert REVIEWER_SYSTEM_PROMPT_SHA256 == hashlib.sha256(REVIEWER_SYSTEM_PROMPT.encode("utf-8")).hexdigest()
+    assert PLANNER_SYSTEM_PROMPT_SHA256 != REVIEWER_SYSTEM_PROMPT_SHA256
+
+    print("✅ test_prompt_sha256_identity passed")
+
+
+def test_planner_prompt_pinned_sha256():
+    """Test that the planner prompt bytes have not drifted (update the pin on intended edits)."""
+    assert PLANNER_SYSTEM_PROMPT_SHA256 == PINNED_PLANNER_SYSTEM_PROMPT_SHA256
+
+    print("✅ test_planner_prompt_pinned_sha256 passed")
+
+
+def test_reviewer_prompt_has_no_inline_schema():
+    """Test that the reviewer output format is enforced by ReviewerScores, not the prompt."""
+    assert "JSON Schema" not in REVIEWER_SYSTEM_PROMPT
+    assert "<integer from 1 to 10>" not in REVIEWER_SYSTEM_PROMPT
+
+    assert "STRICT JSON" not in REVIEWER_SYSTEM_PROMPT
+    assert "NO MARKDOWN" not in REVIEWER_SYSTEM_PROMPT
+
+    print("✅ test_reviewer_prompt_has_no_inline_schema passed")
+
+
+def test_reviewer_prompt_compressed_variant():
+    """Test that the compressed reviewer rubric is shorter and keeps the scoring rules intact."""
+    rules = REVIEWER_SYSTEM_PROMPT[REVIEWER_SYSTEM_PROMPT.index("## Rules"):]
+
+    assert len(REVIEWER_SYSTEM_PROMPT_COMPRESSED) < len(REVIEWER_SYSTEM_PROMPT) * 0.6
+    assert REVIEWER_SYSTEM_PROMPT_COMPRESSED.endswith(rules)
+    assert get_reviewer_prompt(False) is REVIEWER_SYSTEM_PROMPT
+    assert get_reviewer_prompt(True) is REVIEWER_SYSTEM_PROMPT_COMPRESSED
+
+    print("✅ test_reviewer_prompt_compressed_variant passed")
+
+
+def test_reviewer_messages_few_shot():
+    """Test that the worked example is sent as a few-shot pair ahead of the live plan."""
+    messages = build_reviewer_messages("### PROPOSED TRADE PLAN\nBuy 1.0850")
+
+    assert [m["role"] for m in messages] == ["system", "user", "assistant", "user"]
+    assert messages[0]["content"] is REVIEWER_SYSTEM_PROMPT
+    assert "## Example" not in REVIEWER_SYSTEM_PROMPT
+    assert json.loads(messages[2]["content"]) == json.loads(REVIEWER_EXAMPLE_OUTPUT)
+    assert messages[-1]["content"].endswith("Buy 1.0850")
+    assert build_reviewer_messages("x", compressed=True)[0]["content"] is REVIEWER_SYSTEM_PROMPT_COMPRESSED
+
+    print("✅ test_reviewer_messages_few_shot passed")
+
+
+def test_yesterday_brief_is_deterministic():
+    """Test that the Yesterday Brief is canonical, rounded and cached per day."""
+    temporal_analysis = {
+        "previousSessionContext": {
+            "previousSessionDate": "2025_10_14",
+            "previousPlanExists": True,
+            "previousMarketSnapshot": {"currentPrice": 1.163456789, "currentTimeUTC": "2025-10-14T07:03:11+00:00"},
+            "previousKeyLevels": {"support": [1.16, 1.155012], "resistance": [1.1705]},
+            "previousPlanOutcome": {"planQualityScore": {"score": 7}, "confidenceScore": {"score": 6}},
+            "previousPlanContent": "# Full plan text that is too long to resend",
+        },
+        "thesisEvolution": {"previousThesis": "Cautious  Bullish", "thesisModification": "Previous thesis was moderate - monitor for changes"},
+        "marketEvolution": {"priceMovement": {"changePips": 12.3}},
+    }
+    brief = build_yesterday_brief(temporal_analysis)
+
+    assert brief.startswith("### YESTERDAY BRIEF (2025_10_14)")
+    assert "Previous price: 1.1635" in brief
+    assert "Previous support: 1.1600, 1.1550" in brief
+    assert "Previous bias: Cautious Bullish" in brief
+    assert "07:03" not in brief and "Full plan text" not in brief and "12.3" not in brief
+    assert get_yesterday_brief(temporal_analysis, day="2025-10-15") is get_yesterday_brief(temporal_analysis, day="2025-10-15")
+    assert brief == get_yesterday_brief(temporal_analysis, day="2025-10-16")
+    assert all(key[0] == "2025-10-16" for key in prompts._YESTERDAY_BRIEF_CACHE)
+
+    fallback = build_yesterday_brief({"previousSessionDate": "2025_10_14", "previousPlanExists": False})
+    assert "fallback mode" in fallback
+
+    print("✅ test_yesterday_brief_is_deterministic passed")
+
+
+def test_planner_template_flags():
+    """Test that the planner template toggles only the temporal section."""
+    full = render_planner_prompt(include_temporal=True)
+    no_temporal = render_planner_prompt(include_temporal=False)
+
+    assert render_planner_prompt(include_temporal=True) is full
+    assert "Temporal Context Analysis" in full and "Temporal Context Analysis" not in no_temporal
+    assert "{%" not in full and "{#" not in full
+    assert no_temporal.startswith(full[:full.index("CRITICAL: You must consider")])
+
+    print("✅ test_planner_template_flags passed")
+
+
+def test_planner_mt5_addendum_is_suffix():
+    """Test that the MT5 section is opt-in and appended after the shared prefix."""
+    without_mt5 = build_planner_prompt(include_mt5=False)
+    with_mt5 = build_planner_prompt(include_mt5=True)
+
+    assert with_mt5 == PLANNER_SYSTEM_PROMPT_STATIC
+    assert with_mt5.startswith(without_mt5)
+    assert with_mt5.endswith(PLANNER_MT5_ADDENDUM)
+    assert "MT5" not in without_mt5
+    assert "```json" not in PLANNER_MT5_ADDENDUM
+
+    print("✅ test_planner_mt5_addendum_is_suffix passed")
+
+
+def test_prompts_root_shim_import():
+    """Test that the root prompts.py symlink still finds the packaged templates."""
+    shim = importlib.import_module("prompts")
+
+    assert Path(shim.__file__).name == "prompts.py"
+    assert shim.PLANNER_SYSTEM_PROMPT_STATIC == PLANNER_SYSTEM_PROMPT_STATIC
+
+    print("✅ test_prompts_root_shim_import passed")
+
+
+if __name__ == "__main__":
+    print("Running prompt tests...\n")
+
+    test_planner_messages_static_prefix()
+    test_planner_messages_market_data_last()
+    test_planner_prompt_variants()
+    test_prompt_sha256_identity()
+    test_planner_prompt_pinned_sha256()
+    test_reviewer_prompt_has_no_inline_schema()
+    test_reviewer_prompt_compressed_variant()
+    test_reviewer_messages_few_shot()
+    test_yesterday_brief_is_deterministic()
+    test_planner_template_flags()
+    test_planner_mt5_addendum_is_suffix()
+    test_prompts_root_shim_import()
+
+    print("\n✅ All tests passed!")
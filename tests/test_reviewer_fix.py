@@ -13,25 +13,31 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from gemex.prompts import REVIEWER_SYSTEM_PROMPT
-from gemex.market_planner import call_llm, clean_json_output, configure_gemini
+from gemex.schemas import ReviewerScores
+from gemex import market_planner
+from gemex.market_planner import clean_json_output, configure_gemini
+
+# Mock data packet (simplified)
+MOCK_DATA_PACKET = {
+    "marketSnapshot": {
+        "pair": "EURUSD",
+        "currentPrice": 1.0850,
+        "currentTimeUTC": "2025-01-09T10:00:00Z"
+    },
+    "multiTimeframeAnalysis": {
+        "Daily": {"trendDirection": "Bullish"},
+        "H4": {"trendDirection": "Bullish"},
+        "H1": {"trendDirection": "Consolidating"}
+    }
+}
+
+def _truncate(text, limit=500):
+    """Return text cut to limit characters, with an ellipsis when it was cut."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
 
 def test_reviewer_with_mock_data():
     """Test the reviewer with mock trading plan and data packet."""
     
-    # Mock data packet (simplified)
-    mock_data_packet = {
-        "marketSnapshot": {
-            "pair": "EURUSD",
-            "currentPrice": 1.0850,
-            "currentTimeUTC": "2025-01-09T10:00:00Z"
-        },
-        "multiTimeframeAnalysis": {
-            "Daily": {"trendDirection": "Bullish"},
-            "H4": {"trendDirection": "Bullish"},
-            "H1": {"trendDirection": "Consolidating"}
-        }
-    }
-    
     # Mock trade plan
     mock_trade_plan = """
 # EURUSD Trading Plan - 2025-01-09
@@ -73,7 +79,7 @@ def test_reviewer_with_mock_data():
 
         ### ORIGINAL DATA PACKET
         ```json
-        {json.dumps(mock_data_packet, indent=2)}
+        {json.dumps(MOCK_DATA_PACKET, indent=2)}
         ```
 
         ### PROPOSED TRADE PLAN
@@ -86,12 +92,12 @@ def test_reviewer_with_mock_data():
         print(f"System prompt length: {len(REVIEWER_SYSTEM_PROMPT)} chars")
         print(f"User prompt length: {len(reviewer_user_prompt)} chars")
         
-        # Call the LLM with the system prompt (this should now work correctly)
-        review_output_raw = call_llm(REVIEWER_SYSTEM_PROMPT, reviewer_user_prompt)
+        # Call the reviewer with the system prompt and few-shot example (same as run_viper_coil)
+        review_output_raw = market_planner.call_reviewer(reviewer_user_prompt)
         
         print("\n📥 Raw Reviewer Response:")
         print("-" * 30)
-        print(review_output_raw[:500] + "..." if len(review_output_raw) > 500 else review_output_raw)
+        print(_truncate(review_output_raw))
         print("-" * 30)
         
         # Try to parse the JSON
@@ -99,7 +105,7 @@ def test_reviewer_with_mock_data():
         
         if cleaned_output:
             try:
-                review_scores = json.loads(cleaned_output)
+                review_scores = market_planner._loads_json(cleaned_output)
                 print("\n✅ JSON Parsing Successful!")
                 print(f"Plan Quality Score: {review_scores.get('planQualityScore', {}).get('score', 'N/A')}")
                 print(f"Confidence Score: {review_scores.get('confidenceScore', {}).get('score', 'N/A')}")
@@ -127,6 +133,41 @@ def test_reviewer_with_mock_data():
         print(f"❌ Test failed with error: {e}")
         return False
 
+def test_reviewer_response_cache(monkeypatch):
+    """Test that deterministic reviewer calls are cached and sampled calls are not."""
+    calls = []
+
+    def fake_call_llm_messages(messages, temperature=None, response_schema=None):
+        assert response_schema is ReviewerScores
+        calls.append(temperature)
+        return '{"planQualityScore": {"score": 7}, "confidenceScore": {"score": 6}}'
+
+    monkeypatch.setattr(market_planner, "call_llm_messages", fake_call_llm_messages)
+    monkeypatch.setattr(market_planner, "_REVIEW_RESPONSE_CACHE", {})
+
+    first = market_planner.call_reviewer("### PROPOSED TRADE PLAN\n  Buy 1.0850")
+    second = market_planner.call_reviewer("### PROPOSED TRADE PLAN\nBuy   1.0850\n")
+    assert first == second
+    assert calls == [0.0]
+
+    market_planner.call_reviewer("### PROPOSED TRADE PLAN\nBuy 1.0850", temperature=0.7)
+    market_planner.call_reviewer("### PROPOSED TRADE PLAN\nBuy 1.0850", temperature=0.7)
+    assert calls == [0.0, 0.7, 0.7]
+    assert len(market_planner._REVIEW_RESPONSE_CACHE) == 1
+
+    print("✅ test_reviewer_response_cache passed")
+
+def test_reviewer_scores_schema():
+    """Test that the reviewer schema accepts the expected JSON shape."""
+    scores = ReviewerScores.model_validate_json(
+        '{"planQualityScore": {"score": 5, "justification": "Vague rationale."},'
+        ' "confidenceScore": {"score": 4, "justification": "Generic setup."}}'
+    )
+    assert scores.planQualityScore.score == 5
+    assert scores.confidenceScore.justification == "Generic setup."
+
+    print("✅ test_reviewer_scores_schema passed")
+
 if __name__ == "__main__":
     print("🚀 Testing Reviewer LLM Fix")
     print("This test verifies that the system prompt is being used correctly.")
@@ -4,114 +4,114 @@ Test script for the new TelegramMessageBuilder class.
 Tests the concise message format without requiring actual market data.
 """
 
-import json
+import copy
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_BAR50 = "=" * 50
+_BAR40 = "=" * 40
+
+market_planner = pytest.importorskip("market_planner")
+
+# Mock data packet, shaped like the JSON-decoded packets production receives
+MOCK_DATA_PACKET = {
+    "marketSnapshot": {
+        "currentPrice": 1.0835,
+        "currentTimeUTC": "2025-09-06T10:30:00.000000+00:00"
+    },
+    "multiTimeframeAnalysis": {
+        "Daily": {
+            "trendDirection": "Bullish",
+            "keySupportLevels": [1.0800, 1.0780],
+            "keyResistanceLevels": [1.0850, 1.0880]
+        },
+        "H4": {
+            "trendDirection": "Bullish", 
+            "keySupportLevels": [1.0815, 1.0800],
+            "keyResistanceLevels": [1.0845, 1.0860]
+        },
+        "H1": {
+            "trendDirection": "Bullish"
+        }
+    }
+}
+
+PSYCHOLOGY_CONDITIONS = ('calm_market', 'volatile_market', 'general')
 
-def test_telegram_message_builder():
+# Mock review scores
+MOCK_REVIEW_SCORES = {
+    "planQualityScore": {"score": 8},
+    "confidenceScore": {"score": 7}
+}
+
+@pytest.fixture(scope="module")
+def builder():
+    """One TelegramMessageBuilder shared by the tests in this module."""
+    return market_planner.TelegramMessageBuilder()
+
+@pytest.fixture
+def mock_data_packet():
+    """A fresh copy of the mock packet, so no test can change another's data."""
+    return copy.deepcopy(MOCK_DATA_PACKET)
+
+def test_telegram_message_builder(builder, mock_data_packet):
     """Test the TelegramMessageBuilder with mock data."""
-    print("🧪 Testing TelegramMessageBuilder...")
-    print("=" * 50)
+    # Report lines are collected and written once at the end
+    out = ["🧪 Testing TelegramMessageBuilder...", _BAR50]
     
     try:
-        # Import after adding to path
-        from market_planner import TelegramMessageBuilder
-        
-        # Create mock data packet
-        mock_data_packet = {
-            "marketSnapshot": {
-                "currentPrice": 1.0835,
-                "currentTimeUTC": "2025-09-06T10:30:00.000000+00:00"
-            },
-            "multiTimeframeAnalysis": {
-                "Daily": {
-                    "trendDirection": "Bullish",
-                    "keySupportLevels": [1.0800, 1.0780],
-                    "keyResistanceLevels": [1.0850, 1.0880]
-                },
-                "H4": {
-                    "trendDirection": "Bullish", 
-                    "keySupportLevels": [1.0815, 1.0800],
-                    "keyResistanceLevels": [1.0845, 1.0860]
-                },
-                "H1": {
-                    "trendDirection": "Bullish"
-                }
-            }
-        }
-        
-        # Create mock review scores
-        mock_review_scores = {
-            "planQualityScore": {"score": 8},
-            "confidenceScore": {"score": 7}
-        }
-        
-        # Initialize message builder
-        builder = TelegramMessageBuilder()
-        
         # Test summary message
-        print("📊 Testing summary message...")
-        summary_message = builder.build_summary_message(mock_data_packet, mock_review_scores, 5)
-        print("\n" + "="*40)
-        print("SUMMARY MESSAGE:")
-        print("="*40)
-        print(summary_message)
-        print("="*40)
+        out.append("📊 Testing summary message...")
+        summary_message = builder.build_summary_message(mock_data_packet, MOCK_REVIEW_SCORES, 5)
+        out += ["\n" + _BAR40, "SUMMARY MESSAGE:", _BAR40, summary_message, _BAR40]
+        assert "Scores: Q8/C7" in summary_message
         
         # Test technical details
-        print("\n📈 Testing technical details...")
+        out.append("\n📈 Testing technical details...")
         technical_details = builder.build_technical_details(mock_data_packet)
-        print("\n" + "="*40)
-        print("TECHNICAL DETAILS:")
-        print("="*40)
-        print(technical_details)
-        print("="*40)
-        
-        # Test psychology tips
-        print("\n💡 Testing psychology tips...")
-        for condition in ['calm_market', 'volatile_market', 'general']:
-            tip = builder.get_daily_psychology_tip(condition)
-            print(f"{condition}: {tip}")
+        out += ["\n" + _BAR40, "TECHNICAL DETAILS:", _BAR40, technical_details, _BAR40]
+        assert "Support: 1.0815" in technical_details and "Resistance: 1.0845" in technical_details
         
         # Test message length comparison
-        print(f"\n📏 Message Length Analysis:")
-        print(f"Summary message: {len(summary_message)} characters")
-        print(f"Technical details: {len(technical_details)} characters")
-        print(f"Total concise format: {len(summary_message) + len(technical_details)} characters")
+        summary_length = len(summary_message)
+        technical_length = len(technical_details)
+        out.append(f"\n📏 Message Length Analysis:")
+        out.append(f"Summary message: {summary_length} characters")
+        out.append(f"Technical details: {technical_length} characters")
+        out.append(f"Total concise format: {summary_length + technical_length} characters")
         
         # Create a mock old-style message for comparison
         old_style_length = 800  # Estimated from looking at old format
-        reduction_percentage = ((old_style_length - len(summary_message)) / old_style_length) * 100
-        print(f"Estimated reduction: {reduction_percentage:.1f}%")
-        
-        print("\n✅ TelegramMessageBuilder tests completed successfully!")
-        return True
+        reduction_percentage = (old_style_length - summary_length) * 100.0 / old_style_length
+        out.append(f"Estimated reduction: {reduction_percentage:.1f}%")
         
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
-        print("This may be due to missing dependencies - test the class structure only")
-        return False
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        out.append("\n✅ TelegramMessageBuilder tests completed successfully!")
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+
+@pytest.mark.parametrize("condition", PSYCHOLOGY_CONDITIONS)
+def test_psychology_tip(builder, condition):
+    """Test that each market condition yields a psychology tip."""
+    tip = builder.get_daily_psychology_tip(condition)
+    assert tip.startswith("💡")
+    print(f"{condition}: {tip}")
 
 def test_helper_functions():
     """Test the helper functions."""
-    print("\n🔧 Testing helper functions...")
+    out = ["\n🔧 Testing helper functions..."]
     
     try:
-        from market_planner import _determine_market_condition, _create_abbreviated_plan
-        
         # Test market condition determination
-        condition1 = _determine_market_condition("Bullish", "Bullish", 8)
-        condition2 = _determine_market_condition("Bullish", "Bearish", 6)
-        print(f"Aligned trends: {condition1}")
-        print(f"Mixed trends: {condition2}")
+        condition1 = market_planner._determine_market_condition("Bullish", "Bullish", 8)
+        condition2 = market_planner._determine_market_condition("Bullish", "Bearish", 6)
+        out.append(f"Aligned trends: {condition1}")
+        out.append(f"Mixed trends: {condition2}")
+        assert (condition1, condition2) == ("calm_market", "volatile_market")
         
         # Test plan abbreviation
         mock_plan = """
@@ -131,30 +131,14 @@ Risk/Reward: 1:2.5
 Long analysis about market conditions...
 """
         
-        abbreviated = _create_abbreviated_plan(mock_plan)
-        print(f"\nAbbreviated plan ({len(abbreviated)} chars):")
-        print(abbreviated)
-        
-        print("✅ Helper functions working correctly!")
-        return True
+        abbreviated = market_planner._create_abbreviated_plan(mock_plan)
+        out.append(f"\nAbbreviated plan ({len(abbreviated)} chars):")
+        out.append(abbreviated)
+        assert "Stop: 1.0815" in abbreviated
         
-    except Exception as e:
-        print(f"❌ Helper function test failed: {e}")
-        return False
+        out.append("✅ Helper functions working correctly!")
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
-    print("🚀 Testing New Telegram Message Format")
-    print("This test validates the TelegramMessageBuilder implementation")
-    print()
-    
-    success1 = test_telegram_message_builder()
-    success2 = test_helper_functions()
-    
-    print("\n" + "=" * 50)
-    if success1 and success2:
-        print("🎉 ALL TESTS PASSED!")
-        print("New concise Telegram format is working correctly.")
-    else:
-        print("❌ SOME TESTS FAILED")
-        print("Check the implementation for issues.")
-    print("=" * 50)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -4,6 +4,7 @@ Comprehensive test for the refactored Telegram messaging system.
 Tests all scenarios including smart filtering, critical warnings, and conditional messaging.
 """
 
+import copy
 import json
 import sys
 from pathlib import Path
@@ -20,82 +21,89 @@ except ImportError as e:
     print("📋 Running in dependency-free test mode")
     DEPENDENCIES_AVAILABLE = False
 
+# Test scenarios covering different decision types and market conditions (built once;
+# each test run works on its own deep copy)
+_SCENARIOS = (
+    {
+        "name": "Perfect GO Setup - Bull Trend",
+        "data_packet": {
+            "marketSnapshot": {"currentPrice": 1.0835, "currentTimeUTC": "2025-09-06T10:30:00Z"},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bullish", "keySupportLevels": [1.0800, 1.0780], "keyResistanceLevels": [1.0850, 1.0880]},
+                "H4": {"trendDirection": "Bullish", "keySupportLevels": [1.0815], "keyResistanceLevels": [1.0845]},
+                "H1": {"trendDirection": "Bullish"}
+            },
+            "volatilityMetrics": {"atr_14_daily_pips": 88}
+        },
+        "review_scores": {"planQualityScore": {"score": 8}, "confidenceScore": {"score": 8}},
+        "expected_messages": ["summary", "technical_details", "psychology_tip", "execution_plan"],
+        "expected_decision": "GO"
+    },
+    {
+        "name": "WAIT Setup - Mixed Signals", 
+        "data_packet": {
+            "marketSnapshot": {"currentPrice": 1.0820, "currentTimeUTC": "2025-09-06T10:30:00Z"},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bullish", "keySupportLevels": [1.0800], "keyResistanceLevels": [1.0850]},
+                "H4": {"trendDirection": "Bearish", "keySupportLevels": [1.0810], "keyResistanceLevels": [1.0840]},
+                "H1": {"trendDirection": "Neutral"}
+            }
+        },
+        "review_scores": {"planQualityScore": {"score": 7}, "confidenceScore": {"score": 4}},
+        "expected_messages": ["summary", "psychology_tip"],
+        "expected_decision": "WAIT"
+    },
+    {
+        "name": "SKIP Setup - Poor Quality",
+        "data_packet": {
+            "marketSnapshot": {"currentPrice": 1.0810, "currentTimeUTC": "2025-09-06T10:30:00Z"},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bearish", "keySupportLevels": [1.0795], "keyResistanceLevels": [1.0825]},
+                "H4": {"trendDirection": "Bearish", "keySupportLevels": [1.0800], "keyResistanceLevels": [1.0820]},
+                "H1": {"trendDirection": "Bearish"}
+            }
+        },
+        "review_scores": {"planQualityScore": {"score": 3}, "confidenceScore": {"score": 2}},
+        "expected_messages": ["critical_warning", "full_plan"],
+        "expected_decision": "SKIP"
+    },
+    {
+        "name": "High Confidence GO - Non-standard Position",
+        "data_packet": {
+            "marketSnapshot": {"currentPrice": 1.0845, "currentTimeUTC": "2025-09-06T10:30:00Z"},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bullish", "keySupportLevels": [1.0820], "keyResistanceLevels": [1.0870]},
+                "H4": {"trendDirection": "Bullish", "keySupportLevels": [1.0830], "keyResistanceLevels": [1.0860]},
+                "H1": {"trendDirection": "Bullish"}
+            }
+        },
+        "review_scores": {"planQualityScore": {"score": 9}, "confidenceScore": {"score": 10}},
+        "expected_messages": ["summary", "technical_details", "risk_details", "psychology_tip", "execution_plan"],
+        "expected_decision": "GO"
+    }
+)
+
+# Separator lines for the console report
+_BAR60 = "=" * 60
+_BAR50 = "=" * 50
+_DASH50 = "-" * 50
+_DASH40 = "-" * 40
+
 def test_comprehensive_telegram_scenarios():
     """Test all telegram scenarios with the new system."""
     print("🚀 Comprehensive Telegram Messaging Test")
-    print("=" * 60)
+    print(_BAR60)
     
     if not DEPENDENCIES_AVAILABLE:
         print("❌ Skipping tests due to missing dependencies")
         print("💡 To run full tests, install requirements: pip install -r requirements.txt")
         return False
     
-    # Test scenarios covering different decision types and market conditions
-    scenarios = [
-        {
-            "name": "Perfect GO Setup - Bull Trend",
-            "data_packet": {
-                "marketSnapshot": {"currentPrice": 1.0835, "currentTimeUTC": "2025-09-06T10:30:00Z"},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bullish", "keySupportLevels": [1.0800, 1.0780], "keyResistanceLevels": [1.0850, 1.0880]},
-                    "H4": {"trendDirection": "Bullish", "keySupportLevels": [1.0815], "keyResistanceLevels": [1.0845]},
-                    "H1": {"trendDirection": "Bullish"}
-                },
-                "volatilityMetrics": {"atr_14_daily_pips": 88}
-            },
-            "review_scores": {"planQualityScore": {"score": 8}, "confidenceScore": {"score": 8}},
-            "expected_messages": ["summary", "technical_details", "psychology_tip", "execution_plan"],
-            "expected_decision": "GO"
-        },
-        {
-            "name": "WAIT Setup - Mixed Signals", 
-            "data_packet": {
-                "marketSnapshot": {"currentPrice": 1.0820, "currentTimeUTC": "2025-09-06T10:30:00Z"},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bullish", "keySupportLevels": [1.0800], "keyResistanceLevels": [1.0850]},
-                    "H4": {"trendDirection": "Bearish", "keySupportLevels": [1.0810], "keyResistanceLevels": [1.0840]},
-                    "H1": {"trendDirection": "Neutral"}
-                }
-            },
-            "review_scores": {"planQualityScore": {"score": 7}, "confidenceScore": {"score": 4}},
-            "expected_messages": ["summary", "psychology_tip"],
-            "expected_decision": "WAIT"
-        },
-        {
-            "name": "SKIP Setup - Poor Quality",
-            "data_packet": {
-                "marketSnapshot": {"currentPrice": 1.0810, "currentTimeUTC": "2025-09-06T10:30:00Z"},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bearish", "keySupportLevels": [1.0795], "keyResistanceLevels": [1.0825]},
-                    "H4": {"trendDirection": "Bearish", "keySupportLevels": [1.0800], "keyResistanceLevels": [1.0820]},
-                    "H1": {"trendDirection": "Bearish"}
-                }
-            },
-            "review_scores": {"planQualityScore": {"score": 3}, "confidenceScore": {"score": 2}},
-            "expected_messages": ["critical_warning", "full_plan"],
-            "expected_decision": "SKIP"
-        },
-        {
-            "name": "High Confidence GO - Non-standard Position",
-            "data_packet": {
-                "marketSnapshot": {"currentPrice": 1.0845, "currentTimeUTC": "2025-09-06T10:30:00Z"},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bullish", "keySupportLevels": [1.0820], "keyResistanceLevels": [1.0870]},
-                    "H4": {"trendDirection": "Bullish", "keySupportLevels": [1.0830], "keyResistanceLevels": [1.0860]},
-                    "H1": {"trendDirection": "Bullish"}
-                }
-            },
-            "review_scores": {"planQualityScore": {"score": 9}, "confidenceScore": {"score": 10}},
-            "expected_messages": ["summary", "technical_details", "risk_details", "psychology_tip", "execution_plan"],
-            "expected_decision": "GO"
-        }
-    ]
-    
     builder = TelegramMessageBuilder()
     
-    for i, scenario in enumerate(scenarios, 1):
+    for i, scenario in enumerate(copy.deepcopy(_SCENARIOS), 1):
         print(f"\n{i}. Testing: {scenario['name']}")
-        print("-" * 50)
+        print(_DASH50)
         
         data_packet = scenario['data_packet']
         review_scores = scenario['review_scores']
@@ -115,7 +123,7 @@ def test_comprehensive_telegram_scenarios():
             actual_decision = "WAIT"
         else:
             actual_decision = "SKIP"
-            
+        
         decision_match = actual_decision == scenario['expected_decision']
         print(f"Decision: {actual_decision} {'✅' if decision_match else '❌'}")
         
@@ -133,16 +141,17 @@ def test_comprehensive_telegram_scenarios():
                 print(warning)
         
         # Test psychology tip
-        daily_trend = data_packet["multiTimeframeAnalysis"]["Daily"]["trendDirection"]
-        h4_trend = data_packet["multiTimeframeAnalysis"]["H4"]["trendDirection"]
+        # Substring match so values like "Strong Bullish" still count
+        daily_trend = data_packet["multiTimeframeAnalysis"]["Daily"]["trendDirection"].lower()
+        h4_trend = data_packet["multiTimeframeAnalysis"]["H4"]["trendDirection"].lower()
         
-        if 'bull' in daily_trend.lower() and 'bull' in h4_trend.lower():
+        if 'bull' in daily_trend and 'bull' in h4_trend:
             condition = 'calm_market'
-        elif 'bull' in daily_trend.lower() and 'bear' in h4_trend.lower():
+        elif 'bull' in daily_trend and 'bear' in h4_trend:
             condition = 'volatile_market'
         else:
             condition = 'general'
-            
+        
         tip = builder.get_daily_psychology_tip(condition)
         print(f"\n💡 Psychology Tip: {tip}")
         
@@ -154,7 +163,7 @@ def test_comprehensive_telegram_scenarios():
             total_length += len(tip)
             
         print(f"\nTotal length: {total_length} chars")
-        print("=" * 50)
+        print(_BAR50)
     
     print("\n✅ All scenario tests completed successfully!")
     return True
@@ -162,7 +171,7 @@ def test_comprehensive_telegram_scenarios():
 def test_logic_only():
     """Test just the core logic without imports."""
     print("\n🔧 Testing Core Logic Only")
-    print("-" * 40)
+    print(_DASH40)
     
     # Test decision logic
     test_cases = [
@@ -180,7 +189,7 @@ def test_logic_only():
             result = "WAIT"
         else:
             result = "SKIP"
-            
+        
         match = result == case["expected"]
         print(f"Q{q}/C{c} → {result} {'✅' if match else '❌'}")
     
@@ -190,7 +199,7 @@ def test_logic_only():
 def test_message_formatting():
     """Test message formatting consistency."""
     print("\n🎨 Testing Message Formatting")
-    print("-" * 40)
+    print(_DASH40)
     
     # Test emoji consistency
     emojis = {
@@ -237,7 +246,7 @@ if __name__ == "__main__":
     test1 = test_comprehensive_telegram_scenarios()
     test2 = test_message_formatting()
     
-    print("\n" + "=" * 60)
+    print("\n" + _BAR60)
     if test1 and test2:
         print("🎉 ALL COMPREHENSIVE TESTS PASSED!")
         print("\nKey achievements:")
@@ -250,4 +259,4 @@ if __name__ == "__main__":
     else:
         print("❌ SOME TESTS FAILED")
         print("Check implementation for issues.")
-    print("=" * 60)
\ No newline at end of file
+    print(_BAR60)
\ No newline at end of file
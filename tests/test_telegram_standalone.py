@@ -4,9 +4,8 @@ Simple test for TelegramMessageBuilder without external dependencies.
 Tests the core logic and message formatting.
 """
 
-import json
-import random
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 
 # Import shared constants
 try:
@@ -40,191 +39,204 @@ except ImportError:
         ]
     }
 
+# Tip pools as tuples with the 'general' fallback resolved once at import
+_TIPS_TUPLE = {k: tuple(v) for k, v in PSYCHOLOGY_TIPS.items()}
+_GENERAL_TIPS = _TIPS_TUPLE['general']
+
+# Date fields only change at local midnight, so format them once per day
+_DAY_CACHE = {"expires": 0.0, "mmdd": "", "yday": 0}
+
+# Separator lines for the console report
+_BAR50 = "=" * 50
+_DASH40 = "-" * 40
+
+
+def _today_cached():
+    """Return the cached header date and day-of-year, refreshing after local midnight."""
+    cache = _DAY_CACHE
+    if time.time() >= cache["expires"]:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        cache.update(expires=midnight.timestamp(), mmdd=now.strftime("%m/%d"), yday=now.timetuple().tm_yday)
+    return cache
+
+# Summary layout, formatted in one call per message
+_SUMMARY_TEMPLATE = (
+    "📊 MARKET PLAN SUMMARY - {date}\n"
+    "━━━━━━━━━━━━━━━━━━\n"
+    "🎯 EURUSD: {emoji} {decision}\n"
+    "   Price: ${price:.4f}\n"
+    "   Scores: Q{q}/C{c}\n\n"
+    "📈 Market: {market_emoji} {bias} (VIX: {vix})\n\n"
+    "{reason}\n\n"
+    "⚡ Action: {next_step}\n"
+    "━━━━━━━━━━━━━━━━━"
+).format
+
+# Degraded layouts for packets the summary builder cannot read
+_FALLBACK_TMPL = "📊 MARKET SUMMARY\nEURUSD: {p:.4f}\nQuality: {q}/10\nConfidence: {c}/10\nStatus: {s}".format
+_FALLBACK_MESSAGE = "📊 Market analysis completed - check files for details"
+
+# The emoji table never changes, so resolve the per-decision tuples once
+_GO, _WAIT, _SKIP = (VISUAL_INDICATORS["emojis"][k] for k in ("go", "wait", "skip"))
+_DECISION_GO = (_GO, 'GO', '✅ Plan is solid and conviction is high', 'Prepare for execution')
+_DECISION_WAIT = (_WAIT, 'WAIT', '⏸️ Plan is solid, but market feel is off', 'Monitor for confirmation signals')
+_DECISION_SKIP = (_SKIP, 'SKIP', '❌ Quality or confidence too low', 'Wait for better setup')
+
+# (daily_bull, h4_bull) -> (bias text, emoji key); anything else is mixed
+_MARKET_BIAS_TABLE = {(True, True): ("BULLISH", "bullish"), (False, False): ("BEARISH", "bearish")}
+_MIXED_BIAS = ("MIXED", "neutral")
+
 class TestTelegramMessageBuilder:
     """Standalone test version of TelegramMessageBuilder."""
     
+    __slots__ = ("emojis", "psychology_tips")
+    
     def __init__(self):
         self.emojis = VISUAL_INDICATORS["emojis"]
-        self.psychology_tips = PSYCHOLOGY_TIPS
+        self.psychology_tips = _TIPS_TUPLE
         
     def build_summary_message(self, data_packet, review_scores, mt5_alerts_count=0):
         """Build concise primary summary message."""
+        # Only the packet lookups can fail on malformed input; the formatting below runs straight-line
         try:
-            # Extract key data
             current_price = data_packet["marketSnapshot"]["currentPrice"]
-            daily_trend = data_packet["multiTimeframeAnalysis"]["Daily"]["trendDirection"]
-            h4_trend = data_packet["multiTimeframeAnalysis"]["H4"]["trendDirection"]
-            
             quality_score = review_scores['planQualityScore']['score']
             confidence_score = review_scores['confidenceScore']['score']
-            
-            # Get current date for header
-            date_str = datetime.now().strftime("%m/%d")
-            
+        except (KeyError, TypeError) as e:
+            print(f"❌ Error building summary message: {e}")
+            return _FALLBACK_MESSAGE
+        
+        try:
+            daily_trend = data_packet["multiTimeframeAnalysis"]["Daily"]["trendDirection"]
+            h4_trend = data_packet["multiTimeframeAnalysis"]["H4"]["trendDirection"]
+        except (KeyError, TypeError) as e:
+            print(f"❌ Error building summary message: {e}")
+            return self._build_fallback_message(current_price, quality_score, confidence_score)
+        
+        # Get current date for header
+        date_str = _today_cached()["mmdd"]
+        
+        # Score comparisons and the price format spec can still fail on mistyped values
+        try:
             # Determine decision and emoji
-            decision_data = self._get_decision_data(quality_score, confidence_score)
+            emoji, decision, reason, next_step = self._get_decision_data(quality_score, confidence_score)
             
             # Get market bias emoji
-            market_emoji = self._get_market_emoji(daily_trend, h4_trend)
+            daily_bull, h4_bull = self._classify_trends(daily_trend, h4_trend)
+            market_emoji = self._get_market_emoji(daily_bull, h4_bull)
             
             # Calculate VIX level placeholder
             vix_level = "N/A"
             
             # Build primary message
-            message = (
-                f"📊 MARKET PLAN SUMMARY - {date_str}\n"
-                f"━━━━━━━━━━━━━━━━━━\n"
-                f"🎯 EURUSD: {decision_data['emoji']} {decision_data['decision']}\n"
-                f"   Price: ${current_price:.4f}\n"
-                f"   Scores: Q{quality_score}/C{confidence_score}\n\n"
-                f"📈 Market: {market_emoji} {self._get_market_bias(daily_trend, h4_trend)} (VIX: {vix_level})\n\n"
-                f"{decision_data['reason']}\n\n"
-                f"⚡ Action: {decision_data['next_step']}\n"
-                f"━━━━━━━━━━━━━━━━━"
+            return _SUMMARY_TEMPLATE(
+                date=date_str, emoji=emoji, decision=decision, price=current_price,
+                q=quality_score, c=confidence_score, market_emoji=market_emoji,
+                bias=self._get_market_bias(daily_bull, h4_bull), vix=vix_level,
+                reason=reason, next_step=next_step,
             )
-            
-            return message
-            
-        except Exception as e:
+        except (ValueError, TypeError) as e:
             print(f"❌ Error building summary message: {e}")
-            return self._build_fallback_message(data_packet, review_scores)
+            return self._build_fallback_message(current_price, quality_score, confidence_score)
     
     def get_daily_psychology_tip(self, market_condition='general'):
         """Get rotating psychology reminder based on context."""
-        try:
-            tips_pool = self.psychology_tips.get(market_condition, self.psychology_tips['general'])
-            today = datetime.now().timetuple().tm_yday
-            tip_index = today % len(tips_pool)
-            return f"💡 {tips_pool[tip_index]}"
-        except Exception as e:
-            return "💡 Stay disciplined and follow your plan"
+        pool = self.psychology_tips.get(market_condition, _GENERAL_TIPS)
+        return "💡 " + pool[_today_cached()["yday"] % len(pool)]
     
     def _get_decision_data(self, quality_score, confidence_score):
-        """Get decision emoji, text, and reasoning."""
-        if quality_score >= 6 and confidence_score >= 6:
-            return {
-                'emoji': self.emojis['go'],
-                'decision': 'GO',
-                'reason': '✅ Plan is solid and conviction is high',
-                'next_step': 'Prepare for execution'
-            }
-        elif quality_score >= 6 and confidence_score < 6:
-            return {
-                'emoji': self.emojis['wait'], 
-                'decision': 'WAIT',
-                'reason': '⏸️ Plan is solid, but market feel is off',
-                'next_step': 'Monitor for confirmation signals'
-            }
-        else:
-            return {
-                'emoji': self.emojis['skip'],
-                'decision': 'SKIP', 
-                'reason': '❌ Quality or confidence too low',
-                'next_step': 'Wait for better setup'
-            }
+        """Get decision emoji, text, reasoning and next step as a tuple."""
+        if quality_score >= 6:
+            return _DECISION_GO if confidence_score >= 6 else _DECISION_WAIT
+        return _DECISION_SKIP
     
-    def _get_market_emoji(self, daily_trend, h4_trend):
+    def _classify_trends(self, daily_trend, h4_trend):
+        """Return (daily_bull, h4_bull), case-folding each trend once."""
+        daily = daily_trend.casefold() if isinstance(daily_trend, str) else ""
+        h4 = h4_trend.casefold() if isinstance(h4_trend, str) else ""
+        return 'bull' in daily, 'bull' in h4
+    
+    def _get_market_emoji(self, daily_bull, h4_bull):
         """Get market direction emoji based on trend alignment."""
-        daily_bull = 'bull' in str(daily_trend).lower()
-        h4_bull = 'bull' in str(h4_trend).lower()
-        
-        if daily_bull and h4_bull:
-            return self.emojis['bullish']
-        elif not daily_bull and not h4_bull:
-            return self.emojis['bearish']
-        else:
-            return self.emojis['neutral']
+        return self.emojis[_MARKET_BIAS_TABLE.get((daily_bull, h4_bull), _MIXED_BIAS)[1]]
     
-    def _get_market_bias(self, daily_trend, h4_trend):
+    def _get_market_bias(self, daily_bull, h4_bull):
         """Get market bias text."""
-        daily_bull = 'bull' in str(daily_trend).lower()
-        h4_bull = 'bull' in str(h4_trend).lower()
-        
-        if daily_bull and h4_bull:
-            return "BULLISH"
-        elif not daily_bull and not h4_bull:
-            return "BEARISH" 
-        else:
-            return "MIXED"
+        return _MARKET_BIAS_TABLE.get((daily_bull, h4_bull), _MIXED_BIAS)[0]
     
-    def _build_fallback_message(self, data_packet, review_scores):
-        """Build basic fallback message if main builder fails."""
+    def _build_fallback_message(self, current_price, quality_score, confidence_score):
+        """Build basic fallback message, or the generic notice if even that fails."""
         try:
-            current_price = data_packet["marketSnapshot"]["currentPrice"]
-            quality_score = review_scores['planQualityScore']['score']
-            confidence_score = review_scores['confidenceScore']['score']
-            
-            return (
-                f"📊 MARKET SUMMARY\n"
-                f"EURUSD: {current_price:.4f}\n"
-                f"Quality: {quality_score}/10\n"
-                f"Confidence: {confidence_score}/10\n"
-                f"Status: {'GO' if quality_score >= 6 and confidence_score >= 6 else 'WAIT'}"
-            )
-        except Exception:
-            return "📊 Market analysis completed - check files for details"
+            status = 'GO' if quality_score >= 6 and confidence_score >= 6 else 'WAIT'
+            return _FALLBACK_TMPL(p=current_price, q=quality_score, c=confidence_score, s=status)
+        except (ValueError, TypeError):
+            return _FALLBACK_MESSAGE
 
-def test_message_builder():
-    """Test the TelegramMessageBuilder with various scenarios."""
-    print("🧪 Testing TelegramMessageBuilder...")
-    print("=" * 50)
-    
-    builder = TestTelegramMessageBuilder()
-    
-    # Test scenarios
-    scenarios = [
+# (name, data packet, review scores, psychology condition), built once at import
+_SCENARIOS = (
+    (
+        "GO Decision - Strong Bull Trend",
         {
-            "name": "GO Decision - Strong Bull Trend",
-            "data": {
-                "marketSnapshot": {"currentPrice": 1.0835},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bullish"},
-                    "H4": {"trendDirection": "Bullish"}
-                }
-            },
-            "scores": {"planQualityScore": {"score": 8}, "confidenceScore": {"score": 7}}
+            "marketSnapshot": {"currentPrice": 1.0835},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bullish"},
+                "H4": {"trendDirection": "Bullish"}
+            }
         },
+        {"planQualityScore": {"score": 8}, "confidenceScore": {"score": 7}},
+        'calm_market',
+    ),
+    (
+        "WAIT Decision - Mixed Signals",
         {
-            "name": "WAIT Decision - Mixed Signals",
-            "data": {
-                "marketSnapshot": {"currentPrice": 1.0820},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bullish"},
-                    "H4": {"trendDirection": "Bearish"}
-                }
-            },
-            "scores": {"planQualityScore": {"score": 7}, "confidenceScore": {"score": 4}}
+            "marketSnapshot": {"currentPrice": 1.0820},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bullish"},
+                "H4": {"trendDirection": "Bearish"}
+            }
         },
+        {"planQualityScore": {"score": 7}, "confidenceScore": {"score": 4}},
+        'calm_market',
+    ),
+    (
+        "SKIP Decision - Low Quality",
         {
-            "name": "SKIP Decision - Low Quality",
-            "data": {
-                "marketSnapshot": {"currentPrice": 1.0810},
-                "multiTimeframeAnalysis": {
-                    "Daily": {"trendDirection": "Bearish"},
-                    "H4": {"trendDirection": "Bearish"}
-                }
-            },
-            "scores": {"planQualityScore": {"score": 4}, "confidenceScore": {"score": 3}}
-        }
-    ]
+            "marketSnapshot": {"currentPrice": 1.0810},
+            "multiTimeframeAnalysis": {
+                "Daily": {"trendDirection": "Bearish"},
+                "H4": {"trendDirection": "Bearish"}
+            }
+        },
+        {"planQualityScore": {"score": 4}, "confidenceScore": {"score": 3}},
+        'volatile_market',
+    ),
+)
+
+def test_message_builder():
+    """Test the TelegramMessageBuilder with various scenarios."""
+    print("🧪 Testing TelegramMessageBuilder...")
+    print(_BAR50)
     
-    for scenario in scenarios:
-        print(f"\n📋 {scenario['name']}")
-        print("-" * 40)
+    builder = TestTelegramMessageBuilder()
+    
+    for name, data, scores, condition in _SCENARIOS:
+        print(f"\n📋 {name}")
+        print(_DASH40)
         
-        message = builder.build_summary_message(scenario['data'], scenario['scores'])
+        message = builder.build_summary_message(data, scores)
         print(message)
         print(f"Length: {len(message)} characters")
         
         # Test psychology tip for this scenario
-        if 'bull' in str(scenario['data']['multiTimeframeAnalysis']['Daily']['trendDirection']).lower():
-            condition = 'calm_market'
-        else:
-            condition = 'volatile_market'
-        
         tip = builder.get_daily_psychology_tip(condition)
         print(f"Psychology tip: {tip}")
-        print("-" * 40)
+        print(_DASH40)
+    
+    # A mistyped price cannot be formatted; the builder degrades to the generic notice
+    _, data, scores, _ = _SCENARIOS[0]
+    bad_price = {**data, "marketSnapshot": {"currentPrice": "1.0835"}}
+    assert builder.build_summary_message(bad_price, scores) == _FALLBACK_MESSAGE
     
     print("\n✅ Message builder tests completed!")
     return True
@@ -232,7 +244,7 @@ def test_message_builder():
 def test_message_length_comparison():
     """Compare message lengths between old and new format."""
     print("\n📏 Message Length Analysis")
-    print("=" * 50)
+    print(_BAR50)
     
     # Old format example (estimated)
     old_format = """🚀 GemEx Trading Analysis Complete
@@ -256,15 +268,7 @@ def test_message_length_comparison():
     
     # New format
     builder = TestTelegramMessageBuilder()
-    mock_data = {
-        "marketSnapshot": {"currentPrice": 1.0835},
-        "multiTimeframeAnalysis": {
-            "Daily": {"trendDirection": "Bullish"},
-            "H4": {"trendDirection": "Bullish"}
-        }
-    }
-    mock_scores = {"planQualityScore": {"score": 8}, "confidenceScore": {"score": 7}}
-    
+    _, mock_data, mock_scores, _ = _SCENARIOS[0]
     new_format = builder.build_summary_message(mock_data, mock_scores)
     
     print(f"Old format length: {len(old_format)} characters")
@@ -279,9 +283,9 @@ def test_message_length_comparison():
         print(f"⚠️ New format is longer - consider further optimization")
     
     print(f"\nNew format preview:")
-    print("-" * 40)
+    print(_DASH40)
     print(new_format)
-    print("-" * 40)
+    print(_DASH40)
 
 if __name__ == "__main__":
     print("🚀 Testing New Telegram Message Format (Standalone)")
@@ -291,10 +295,10 @@ if __name__ == "__main__":
     success1 = test_message_builder()
     test_message_length_comparison()
     
-    print("\n" + "=" * 50)
+    print("\n" + _BAR50)
     if success1:
         print("🎉 TESTS PASSED!")
         print("New concise Telegram format is working correctly.")
     else:
         print("❌ TESTS FAILED")
-    print("=" * 50)
\ No newline at end of file
+    print(_BAR50)
\ No newline at end of file